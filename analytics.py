@@ -0,0 +1,125 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, NamedTuple, Tuple
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+class Aggregates(NamedTuple):
+    """Counts behind the analytics charts"""
+    source_counts: pd.Series
+    sector_counts: pd.Series
+    daily_counts: pd.DataFrame
+
+
+def compute_aggregates(df: pd.DataFrame) -> Aggregates:
+    """Per-source, per-sector and per-day counts of a signals frame
+
+    The frame is only read, never modified, so it can be a shared snapshot.
+    """
+    # normalize() stays vectorized, unlike .dt.date which builds Python objects
+    daily = df['publish_date'].dt.normalize().value_counts().sort_index()
+    return Aggregates(
+        source_counts=df['source'].value_counts(),
+        sector_counts=df['sector'].value_counts(),
+        daily_counts=daily.rename_axis('date').reset_index(name='count'),
+    )
+
+
+def store_aggregates(store, **filters) -> Aggregates:
+    """compute_aggregates for the signals in a SignalStore matching filters, counted in SQL"""
+    return Aggregates(
+        source_counts=store.value_counts('source', **filters),
+        sector_counts=store.value_counts('sector', **filters),
+        daily_counts=store.daily_counts(**filters),
+    )
+
+
+def build_figures(aggregates: Aggregates) -> Dict[str, 'go.Figure']:
+    """Plotly figures for the analytics tab"""
+    # Plotly Express is slow to import; only pay for it once a chart is drawn
+    import plotly.express as px
+
+    fig_source = px.bar(
+        x=aggregates.source_counts.index,
+        y=aggregates.source_counts.values,
+        labels={'x': 'Source', 'y': 'Count'},
+        title="Signal Distribution by Source"
+    )
+    fig_source.update_layout(showlegend=False, height=300)
+
+    fig_sector = px.pie(
+        values=aggregates.sector_counts.values,
+        names=aggregates.sector_counts.index,
+        title="Signal Distribution by Sector"
+    )
+    fig_sector.update_layout(height=300)
+
+    fig_timeline = px.line(
+        aggregates.daily_counts,
+        x='date',
+        y='count',
+        title="Daily Signal Volume",
+        markers=True
+    )
+    fig_timeline.update_layout(height=300)
+
+    return {'source': fig_source, 'sector': fig_sector, 'timeline': fig_timeline}
+
+
+def filters_key(filters: Dict) -> str:
+    """Stable hash of a dashboard filter dict"""
+    encoded = json.dumps(filters, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+class AnalyticsCache:
+    """Bounded LRU of analytics figures keyed by snapshot version and filters
+
+    Building the Plotly figures costs far more than drawing them, and the
+    inputs only change when the refresher publishes a new snapshot or the
+    filters change. Entries are shared by every session, so a figure set is
+    built once per (snapshot version, filters) and reused on every rerun.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[Hashable, str], Dict[str, go.Figure]]' = OrderedDict()
+
+    def figures(self, version: Hashable, filters: Dict,
+                aggregates: Callable[[], Aggregates]) -> Dict[str, 'go.Figure']:
+        """Figures for the filtered signals, built on the first request for this version and filter set
+
+        aggregates is only called on a miss. Callers must not modify the
+        returned figures; they are shared.
+        """
+        key = (version, filters_key(filters))
+        with self._lock:
+            figures = self._entries.get(key)
+            if figures is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return figures
+            self.misses += 1
+
+        # Built outside the lock; a concurrent miss on the same key just builds twice
+        figures = build_figures(aggregates())
+
+        with self._lock:
+            self._entries[key] = figures
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figures
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,11 +1,18 @@
 import streamlit as st
 import pandas as pd
 import json
+import logging
+import time
 from datetime import datetime, timedelta
 from scrapers import StartupSignalScraper
-import plotly.express as px
-import plotly.graph_objects as go
-from typing import List, Dict
+from refresher import BackgroundRefresher
+from signal_store import SignalStore, filters_to_query
+from analytics import AnalyticsCache, store_aggregates
+from columnar import KeywordVocabulary, keyword_masks, mask_columns
+from export import EXPORT_FORMATS, export_file, export_filename
+from config import SCRAPING_SETTINGS
+import metrics
+from typing import List, Dict, Optional
 
 # Page configuration
 st.set_page_config(
@@ -79,40 +86,73 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_signal_store() -> SignalStore:
+    """Process-wide durable signal store shared by all sessions"""
+    return SignalStore(SCRAPING_SETTINGS['store_path'])
+
+@st.cache_resource
+def get_refresher() -> BackgroundRefresher:
+    """Process-wide background refresher; the only place scraping happens"""
+    scraper = StartupSignalScraper(store=get_signal_store())
+    return BackgroundRefresher(
+        scraper,
+        interval=SCRAPING_SETTINGS['refresh_interval'],
+        days_back=SCRAPING_SETTINGS['refresh_days_back']
+    ).start()
+
+@st.cache_resource
+def get_analytics_cache() -> AnalyticsCache:
+    """Process-wide analytics figure cache shared by all sessions"""
+    return AnalyticsCache(SCRAPING_SETTINGS['analytics_cache_size'])
+
+@st.cache_resource
+def start_metrics_endpoint():
+    """Process-wide Prometheus endpoint; disabled when metrics_port is None"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    port = SCRAPING_SETTINGS['metrics_port']
+    return metrics.serve(port, SCRAPING_SETTINGS['metrics_host']) if port is not None else None
+
 def initialize_session_state():
-    """Initialize session state variables"""
-    if 'signals_df' not in st.session_state:
-        st.session_state.signals_df = pd.DataFrame()
-    if 'scraper' not in st.session_state:
-        st.session_state.scraper = StartupSignalScraper()
-    if 'last_scrape_time' not in st.session_state:
-        st.session_state.last_scrape_time = None
+    """Load the latest published snapshot into session state"""
+    snapshot = get_refresher().snapshot()
+    st.session_state.snapshot = snapshot
+    st.session_state.last_scrape_time = snapshot.refreshed_at
 
 def scrape_signals(days_back: int = 7):
-    """Scrape signals and update session state"""
-    with st.spinner("🔍 Scraping startup signals..."):
-        st.session_state.signals_df = st.session_state.scraper.get_all_signals(days_back)
-        st.session_state.last_scrape_time = datetime.now()
-        
-        if not st.session_state.signals_df.empty:
-            st.success(f"✅ Found {len(st.session_state.signals_df)} signals")
-        else:
-            st.warning("⚠️ No signals found. Try increasing the time range.")
+    """Ask the background refresher for an immediate refresh"""
+    get_refresher().request_refresh(days_back)
+    st.toast("🔍 Refresh requested")
 
-def filter_signals(df: pd.DataFrame, filters: Dict) -> pd.DataFrame:
-    """Apply filters to the signals DataFrame"""
+def filter_signals(df: pd.DataFrame, filters: Dict,
+                   vocabulary: Optional[KeywordVocabulary] = None) -> pd.DataFrame:
+    """Apply filters to an in-memory signals DataFrame (the dashboard queries the store instead)
+    
+    Compact frames (keyword bitmasks instead of lists) need the vocabulary
+    their masks were built with.
+    """
     if df.empty:
         return df
     
+    compact = bool(mask_columns(df))
+    if compact and vocabulary is None:
+        raise ValueError("filtering a compact signals frame needs its KeywordVocabulary")
+    
     filtered_df = df.copy()
     
     # Keyword filter
     if filters['keyword']:
+        keyword = filters['keyword']
         mask = (
-            filtered_df['title'].str.contains(filters['keyword'], case=False, na=False) |
-            filtered_df['summary'].str.contains(filters['keyword'], case=False, na=False) |
-            filtered_df['keywords'].astype(str).str.contains(filters['keyword'], case=False, na=False)
+            filtered_df['title'].str.contains(keyword, case=False, na=False, regex=False) |
+            filtered_df['summary'].str.contains(keyword, case=False, na=False, regex=False)
         )
+        if compact:
+            # Look the term up in the vocabulary once, then test the bitmasks
+            matching = [name for name in vocabulary.keywords if keyword.lower() in name.lower()]
+            mask |= vocabulary.contains(keyword_masks(filtered_df), matching)
+        else:
+            mask |= filtered_df['keywords'].str.join(' ').str.contains(keyword, case=False, na=False, regex=False)
         filtered_df = filtered_df[mask]
     
     # Region filter
@@ -138,13 +178,43 @@ def filter_signals(df: pd.DataFrame, filters: Dict) -> pd.DataFrame:
     
     return filtered_df
 
-def display_signal_cards(df: pd.DataFrame):
-    """Display signals as cards"""
-    if df.empty:
-        st.info("🔍 No signals match your current filters.")
-        return
+# Sort options for the signal list: label -> (column, ascending) pairs
+SORT_OPTIONS = {
+    "Signal score": [('signal_score', False), ('publish_date', False)],
+    "Newest": [('publish_date', False)],
+    "Oldest": [('publish_date', True)],
+    "Source": [('source', True), ('signal_score', False)],
+}
+
+PAGE_SIZES = [10, 25, 50, 100]
+
+def select_page(store: SignalStore, query: Dict, count: int, page_size: int = 25,
+                sort_by: str = "Signal score") -> pd.DataFrame:
+    """Page selector for the filtered signals; returns the chosen page
+    
+    Sorting and paging run in the store, so only page_size rows are read
+    and rendered per run, however many signals match.
+    """
+    total_pages = max(1, -(-count // page_size))
+    # Filters may have shrunk the result since the page was chosen
+    if st.session_state.get('signal_page', 1) > total_pages:
+        st.session_state.signal_page = total_pages
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page = st.number_input("Page", min_value=1, max_value=total_pages, step=1, key='signal_page')
     
-    for idx, row in df.iterrows():
+    start = (page - 1) * page_size
+    with metrics.stage('dashboard_page'):
+        page_df = store.query(limit=page_size, offset=start, order=SORT_OPTIONS[sort_by], **query)
+    
+    with col2:
+        st.caption(f"Showing {start + 1}–{start + len(page_df)} of {count} signals")
+    return page_df
+
+def display_signal_cards(page_df: pd.DataFrame):
+    """Display a page of signals as cards"""
+    for row in page_df.to_dict('records'):
         with st.container():
             st.markdown(f"""
             <div class="signal-card">
@@ -167,81 +237,90 @@ def display_signal_cards(df: pd.DataFrame):
             # Add expandable section for keywords and link
             with st.expander("🔍 Details"):
                 st.write(f"**Keywords:** {', '.join(row['keywords'])}")
+                sources = row.get('sources')
+                if isinstance(sources, list) and len(sources) > 1:
+                    st.write(f"**Also reported by:** {', '.join(s for s in sources if s != row['source'])}")
                 if row['url']:
                     st.write(f"**URL:** {row['url']}")
 
-def display_analytics(df: pd.DataFrame):
-    """Display analytics charts"""
-    if df.empty:
-        return
+def display_signal_table(page_df: pd.DataFrame):
+    """Display a page of signals in a single compact dataframe widget"""
+    columns = ['title', 'source', 'publish_date', 'signal_score', 'region', 'sector', 'keywords', 'url']
+    st.dataframe(
+        page_df[columns],
+        width='stretch',
+        hide_index=True,
+        column_config={
+            'title': st.column_config.TextColumn("Title", width="large"),
+            'publish_date': st.column_config.DatetimeColumn("Published", format="YYYY-MM-DD HH:mm"),
+            'signal_score': st.column_config.NumberColumn("Score", format="%.1f"),
+            'keywords': st.column_config.ListColumn("Keywords"),
+            'url': st.column_config.LinkColumn("URL"),
+        }
+    )
+
+def display_analytics(store: SignalStore, query: Dict, version, filters: Dict):
+    """Display analytics charts, counted in the store and cached per version and filters"""
+    figures = get_analytics_cache().figures(version, filters, lambda: store_aggregates(store, **query))
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("📊 Signals by Source")
-        source_counts = df['source'].value_counts()
-        fig_source = px.bar(
-            x=source_counts.index,
-            y=source_counts.values,
-            labels={'x': 'Source', 'y': 'Count'},
-            title="Signal Distribution by Source"
-        )
-        fig_source.update_layout(showlegend=False, height=300)
-        st.plotly_chart(fig_source, use_container_width=True)
+        st.plotly_chart(figures['source'], width='stretch')
     
     with col2:
         st.subheader("🏢 Signals by Sector")
-        sector_counts = df['sector'].value_counts()
-        fig_sector = px.pie(
-            values=sector_counts.values,
-            names=sector_counts.index,
-            title="Signal Distribution by Sector"
-        )
-        fig_sector.update_layout(height=300)
-        st.plotly_chart(fig_sector, use_container_width=True)
+        st.plotly_chart(figures['sector'], width='stretch')
     
     # Timeline chart
     st.subheader("📈 Signal Timeline")
-    df['date'] = df['publish_date'].dt.date
-    daily_counts = df.groupby('date').size().reset_index(name='count')
-    
-    fig_timeline = px.line(
-        daily_counts,
-        x='date',
-        y='count',
-        title="Daily Signal Volume",
-        markers=True
+    st.plotly_chart(figures['timeline'], width='stretch')
+
+def export_data(store: SignalStore, filters: Dict, format: str):
+    """Offer the filtered signals for download, generated only when clicked"""
+    query = filters_to_query(filters)
+    mime = EXPORT_FORMATS[format][1]
+    st.download_button(
+        label=f"📥 Download {format}",
+        # Called on click, on its own thread; chunks from the store are
+        # spooled to a temporary file that Streamlit reads once
+        data=lambda: export_file(store, format, **query),
+        file_name=export_filename(format),
+        mime=mime
     )
-    fig_timeline.update_layout(height=300)
-    st.plotly_chart(fig_timeline, use_container_width=True)
 
-def export_data(df: pd.DataFrame, format: str):
-    """Export filtered data"""
-    if df.empty:
-        st.warning("No data to export")
-        return
-    
-    if format == "JSON":
-        # Convert DataFrame to JSON
-        json_data = df.to_json(orient='records', date_format='iso', indent=2)
-        st.download_button(
-            label="📥 Download JSON",
-            data=json_data,
-            file_name=f"startup_signals_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-            mime="application/json"
-        )
-    elif format == "CSV":
-        # Convert DataFrame to CSV
-        csv_data = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download CSV",
-            data=csv_data,
-            file_name=f"startup_signals_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
+def display_health():
+    """Sidebar panel with per-source fetch health and stage timings"""
+    with st.sidebar.expander("🩺 Health"):
+        last_error = get_refresher().last_error
+        if last_error:
+            st.error(f"Last refresh failed: {last_error}")
+        
+        sources = metrics.source_health()
+        if sources:
+            st.caption("Sources")
+            st.dataframe(pd.DataFrame(sources), hide_index=True)
+        else:
+            st.caption("No fetches recorded yet")
+        
+        stages = metrics.stage_health()
+        if stages:
+            st.caption("Stages")
+            st.dataframe(pd.DataFrame(stages), hide_index=True)
+        
+        hosts = metrics.host_health()
+        if hosts:
+            st.caption("Hosts (rate limit)")
+            st.dataframe(pd.DataFrame(hosts), hide_index=True)
+        
+        if SCRAPING_SETTINGS['metrics_port'] is not None:
+            st.caption(f"Prometheus metrics on {SCRAPING_SETTINGS['metrics_host']}:"
+                       f"{SCRAPING_SETTINGS['metrics_port']} at /metrics")
 
 def main():
     """Main application function"""
+    start_metrics_endpoint()
     initialize_session_state()
     
     # Header
@@ -260,42 +339,53 @@ def main():
         help="Number of days back to scrape"
     )
     
-    if st.sidebar.button("🔄 Refresh Signals", type="primary"):
-        scrape_signals(days_back)
+    live_updates = st.sidebar.checkbox(
+        "Live updates",
+        value=True,
+        help="Show signals as each source finishes while a refresh is running"
+    )
     
-    # Auto-refresh on app load if no data
-    if st.session_state.signals_df.empty:
+    if st.sidebar.button("🔄 Refresh Signals", type="primary"):
         scrape_signals(days_back)
     
-    # Display last scrape time
+    # Display refresh status and last scrape time
+    snapshot = st.session_state.snapshot
+    if snapshot.in_progress:
+        st.sidebar.warning("⏳ Refreshing signals...")
     if st.session_state.last_scrape_time:
         st.sidebar.info(f"Last updated: {st.session_state.last_scrape_time.strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Filters
     st.sidebar.subheader("🔍 Filters")
+    store = get_signal_store()
+    # Everything below reads the store, which the refresher writes as sources finish
+    total = store.count()
     
     filters = {}
     
     # Keyword search
-    filters['keyword'] = st.sidebar.text_input("Search Keywords", help="Search in title, summary, or keywords")
+    filters['keyword'] = st.sidebar.text_input(
+        "Search Keywords",
+        help="Words in title, summary, or keywords; all must match, as word prefixes. Quote a phrase to match it exactly."
+    )
     
     # Region filter
-    if not st.session_state.signals_df.empty:
-        regions = ['All'] + sorted(st.session_state.signals_df['region'].unique().tolist())
+    if total:
+        regions = ['All'] + store.distinct('region')
         filters['region'] = st.sidebar.selectbox("Region", regions)
     else:
         filters['region'] = 'All'
     
     # Sector filter
-    if not st.session_state.signals_df.empty:
-        sectors = ['All'] + sorted(st.session_state.signals_df['sector'].unique().tolist())
+    if total:
+        sectors = ['All'] + store.distinct('sector')
         filters['sector'] = st.sidebar.selectbox("Sector", sectors)
     else:
         filters['sector'] = 'All'
     
     # Source filter
-    if not st.session_state.signals_df.empty:
-        sources = ['All'] + sorted(st.session_state.signals_df['source'].unique().tolist())
+    if total:
+        sources = ['All'] + store.distinct('source')
         filters['source'] = st.sidebar.selectbox("Source", sources)
     else:
         filters['source'] = 'All'
@@ -304,7 +394,7 @@ def main():
     filters['date_range'] = st.sidebar.slider(
         "Days Back",
         min_value=1,
-        max_value=30,
+        max_value=365,
         value=7,
         help="Filter signals from last N days"
     )
@@ -313,40 +403,52 @@ def main():
     filters['min_score'] = st.sidebar.slider(
         "Minimum Signal Score",
         min_value=0,
-        max_value=10,
+        max_value=20,
         value=0,
         help="Filter by minimum signal strength"
     )
     
+    # Display options
+    st.sidebar.subheader("🗂️ Display")
+    view_mode = st.sidebar.radio("View", ["Cards", "Table"], horizontal=True,
+                                 help="Table mode shows each page in one compact widget")
+    sort_by = st.sidebar.selectbox("Sort By", list(SORT_OPTIONS))
+    page_size = st.sidebar.selectbox("Signals Per Page", PAGE_SIZES, index=1)
+    
     # Export options
     st.sidebar.subheader("📥 Export")
-    export_format = st.sidebar.selectbox("Export Format", ["JSON", "CSV"])
+    export_format = st.sidebar.selectbox("Export Format", list(EXPORT_FORMATS))
+    
+    # Scrape health
+    display_health()
     
-    # Apply filters
-    filtered_df = filter_signals(st.session_state.signals_df, filters)
+    # Apply filters in the store: counts and the metrics row come from one
+    # aggregate query, and only the visible page of signals is read
+    query = filters_to_query(filters)
+    with metrics.stage('dashboard_query'):
+        summary = store.summary(**query)
+    filtered = summary['count']
     
     # Main content area
-    if not st.session_state.signals_df.empty:
+    if total:
         # Metrics row
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Signals", len(st.session_state.signals_df))
+            st.metric("Total Signals", total)
         
         with col2:
-            st.metric("Filtered Signals", len(filtered_df))
+            st.metric("Filtered Signals", filtered)
         
         with col3:
-            if not filtered_df.empty:
-                avg_score = filtered_df['signal_score'].mean()
-                st.metric("Avg Signal Score", f"{avg_score:.1f}")
+            if filtered:
+                st.metric("Avg Signal Score", f"{summary['avg_score']:.1f}")
             else:
                 st.metric("Avg Signal Score", "N/A")
         
         with col4:
-            if not filtered_df.empty:
-                top_source = filtered_df['source'].value_counts().index[0]
-                st.metric("Top Source", top_source)
+            if filtered:
+                st.metric("Top Source", summary['source_counts'].index[0])
             else:
                 st.metric("Top Source", "N/A")
         
@@ -354,18 +456,33 @@ def main():
         tab1, tab2 = st.tabs(["📋 Signals", "📊 Analytics"])
         
         with tab1:
-            # Export button
-            if not filtered_df.empty:
-                export_data(filtered_df, export_format)
-            
-            # Display signals
-            display_signal_cards(filtered_df)
+            if not filtered:
+                st.info("🔍 No signals match your current filters.")
+            else:
+                # Export button
+                export_data(store, filters, export_format)
+                
+                # Display signals
+                page_df = select_page(store, query, filtered, page_size, sort_by)
+                if view_mode == "Table":
+                    display_signal_table(page_df)
+                else:
+                    display_signal_cards(page_df)
         
         with tab2:
-            display_analytics(filtered_df)
+            if filtered:
+                # The total catches writes made outside the refresher (e.g. edgar.py)
+                display_analytics(store, query, (snapshot.version, total), filters)
     
+    elif snapshot.in_progress:
+        st.info("🔍 Collecting startup signals... results will appear as each source finishes.")
     else:
         st.info("👋 Welcome to StartupSignal! Click 'Refresh Signals' to start detecting startup activity.")
+    
+    # Pick up newer snapshots while the refresher is still running
+    if live_updates and snapshot.in_progress:
+        time.sleep(1)
+        st.rerun()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: compiled KeywordMatcher vs the per-keyword regex loop
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CUSTOM_KEYWORDS
+from matching import KeywordMatcher
+from scrapers import STARTUP_KEYWORDS
+
+FILLER = (
+    'the company said on tuesday that its new platform would help customers '
+    'manage cloud costs while the market for enterprise software keeps growing '
+    'analysts expect more deals this quarter as investors return to tech'
+).split()
+
+
+def legacy_find(keywords, text):
+    """The original per-keyword loop from _find_startup_keywords"""
+    text_lower = text.lower()
+    return [kw for kw in keywords if re.search(r'\b' + re.escape(kw) + r'\b', text_lower)]
+
+
+def make_entries(keywords, count, seed=42):
+    """Build synthetic title + summary texts with a sprinkling of keywords"""
+    rng = random.Random(seed)
+    entries = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(30, 120))
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords).title())
+        entries.append(' '.join(words))
+    return entries
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entries', type=int, default=5000)
+    parser.add_argument('--custom', action='store_true', help='Include config.CUSTOM_KEYWORDS')
+    args = parser.parse_args()
+
+    # The scraper's own list; building a scraper would create its cache in the cwd
+    keywords = list(STARTUP_KEYWORDS)
+    if args.custom:
+        keywords += CUSTOM_KEYWORDS
+    entries = make_entries(keywords, args.entries)
+    matcher = KeywordMatcher(keywords)
+
+    expected, legacy_time = timed(lambda: [legacy_find(keywords, text) for text in entries])
+    found, find_time = timed(lambda: [matcher.find(text) for text in entries])
+
+    assert found == expected, 'find() differs from the legacy loop'
+
+    print(f"{len(entries)} entries, {len(keywords)} keywords")
+    print(f"  legacy loop : {legacy_time * 1000:8.1f} ms")
+    print(f"  find()      : {find_time * 1000:8.1f} ms  ({legacy_time / find_time:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Offline pipeline benchmark: replays recorded fixtures and times each stage
+
+The default mode serves benchmarks/fixtures (an RSS feed, an EDGAR Form D
+atom feed and a university news page) from a local HTTP server and runs
+the real fetch and parse code against it, so no network is needed.
+--scale synthesizes 10k, 100k or 1m entries from the fixture items for
+the per-entry stages. Results are printed as a table and, with --output,
+written as JSON so runs can be compared over time. Correctness checks on
+the fixtures and a time budget for region/sector tagging run too; the
+exit status is non-zero if any fails.
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import logging
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import feedparser
+import pandas as pd
+import requests
+import streamlit
+import streamlit.logger
+
+# app.py calls Streamlit at import time; keep bare-mode warnings out of the output
+streamlit.config.set_option('global.showWarningOnDirectExecution', False)
+streamlit.logger.set_log_level('error')
+
+import app
+from analytics import store_aggregates
+from columnar import clean_summary
+from config import REGION_PATTERNS, SECTOR_PATTERNS
+from dedup import Deduplicator
+from edgar import accession_number, parse_form_index, read_index
+from http_cache import HTTPCache
+from listing_parser import parse_listing
+from scrapers import StartupSignalScraper
+from seen_index import SeenIndex
+from signal_store import SignalStore
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+RSS_FIXTURE = 'rss_feed.xml'
+EDGAR_FIXTURE = 'edgar_form_d.atom'
+UNIVERSITY_FIXTURE = 'university_news.html'
+EDGAR_INDEX_FIXTURE = 'form.20240102.idx'
+UNIVERSITY_PAGE_URL = 'https://news.example.edu/topic/innovation'
+
+SCALES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+# Region/sector tagging budget for one batch of TAG_CHECK_ROWS signals
+TAG_CHECK_ROWS = 30_000
+TAG_TARGET_SECONDS = 1.0
+
+# Words mixed into synthetic entries so they aren't all near-duplicates
+FILLER = (
+    'the company said on tuesday that its new platform would help customers '
+    'manage cloud costs while the market for enterprise software keeps growing '
+    'analysts expect more deals this quarter as investors return to tech'
+).split()
+
+# Filters a typical dashboard session applies
+FILTERS = {
+    'keyword': 'startup',
+    'region': 'All',
+    'sector': 'All',
+    'source': 'All',
+    'date_range': 30,
+    'min_score': 1,
+}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def fixture_server():
+    """Serve the fixtures directory on a free localhost port; yields the base URL"""
+    handler = functools.partial(QuietHandler, directory=FIXTURES)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class Results:
+    """Stage timings, best of --repeat runs"""
+
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.stages = {}
+        self.failures = []
+
+    def measure(self, stage: str, items: int, fn):
+        """Time fn (best of repeat runs) and return its last result"""
+        best = None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        self.stages[stage] = {
+            'seconds': round(best, 6),
+            'items': items,
+            'us_per_item': round(best / items * 1e6, 3) if items else None,
+        }
+        return result
+
+    def check(self, ok: bool, failure: str):
+        """Record a failed correctness check"""
+        if not ok:
+            self.failures.append(failure)
+
+    def print_table(self, out=sys.stderr):
+        width = max(len(stage) for stage in self.stages)
+        for stage, timing in self.stages.items():
+            per_item = f"{timing['us_per_item']:10.1f} us/item" if timing['us_per_item'] is not None else ''
+            print(f"  {stage:<{width}} : {timing['seconds'] * 1000:10.1f} ms  "
+                  f"{timing['items']:>9} items {per_item}", file=out)
+
+
+def quiet(fn):
+    """Run fn with the scraper's progress logging suppressed"""
+    def run():
+        logging.disable(logging.WARNING)
+        try:
+            return fn()
+        finally:
+            logging.disable(logging.NOTSET)
+    return run
+
+
+def fixture_bytes(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def fixture_entries(scraper: StartupSignalScraper):
+    """(title, summary) pairs from every fixture"""
+    entries = []
+    for name in (RSS_FIXTURE, EDGAR_FIXTURE):
+        for entry in feedparser.parse(fixture_bytes(name)).entries:
+            entries.append((entry.get('title', ''), entry.get('summary', '')))
+    entries.extend(
+        (article.title, article.text)
+        for article in parse_listing(fixture_bytes(UNIVERSITY_FIXTURE), UNIVERSITY_PAGE_URL)
+    )
+    return entries
+
+
+def make_signals(scraper: StartupSignalScraper, templates, count: int, seed: int = 42):
+    """Synthesize count signal dicts (before keyword matching) from fixture items"""
+    rng = random.Random(seed)
+    sources = list(scraper.rss_sources) + ['SEC EDGAR', 'University News']
+    now = datetime.now()
+    signals = []
+    for i in range(count):
+        title, summary = templates[i % len(templates)]
+        source = sources[i % len(sources)]
+        filler = ' '.join(rng.choices(FILLER, k=40))
+        signals.append({
+            'entry_id': f'{source}|bench-{i}',
+            'title': f'{title} ({i})',
+            'source': source,
+            'url': f'https://example.com/{source.lower().replace(" ", "-")}/{i}',
+            'summary': f'{filler} {summary}',
+            'publish_date': now - timedelta(minutes=rng.randint(0, 60 * 24 * 30)),
+            'content_type': 'RSS Feed',
+        })
+    return signals
+
+
+def run_fetch_stages(results: Results, scraper: StartupSignalScraper, feeds: int):
+    """Fetch, parse and end-to-end stages against the local fixture server"""
+    with fixture_server() as base_url, tempfile.TemporaryDirectory() as cache_dir:
+        # Distinct query strings give every simulated feed its own cache entry
+        urls = [f'{base_url}/{RSS_FIXTURE}?feed={i}' for i in range(feeds)]
+        session = requests.Session()
+
+        cold_cache = lambda: HTTPCache(os.path.join(cache_dir, f'cold-{time.perf_counter_ns()}'), 50 * 1024 * 1024)
+        results.measure('fetch_cold', len(urls), lambda: [cold_cache().get(session, url) for url in urls])
+
+        warm = HTTPCache(os.path.join(cache_dir, 'warm'), 50 * 1024 * 1024)
+        for url in urls:
+            warm.get(session, url)
+        results.measure('fetch_conditional', len(urls), lambda: [warm.get(session, url) for url in urls])
+
+        # A 304 for an entry whose body went missing must refetch it, not fail
+        key = warm.get(session, urls[0]).key
+        os.remove(os.path.join(warm.cache_dir, key + '.body'))
+        response = warm.get(session, urls[0])
+        results.check(response.ok and response.content == fixture_bytes(RSS_FIXTURE),
+                      'HTTP cache did not refetch an entry whose body was missing')
+
+        rss, edgar, university = (fixture_bytes(name) for name in (RSS_FIXTURE, EDGAR_FIXTURE, UNIVERSITY_FIXTURE))
+        results.measure('parse_rss', 1, lambda: feedparser.parse(rss))
+        results.measure('parse_edgar', 1, lambda: feedparser.parse(edgar))
+        results.measure('parse_university', 1, lambda: parse_listing(university, UNIVERSITY_PAGE_URL))
+        results.measure('parse_edgar_index', 1, lambda: list(parse_form_index(
+            read_index(os.path.join(FIXTURES, EDGAR_INDEX_FIXTURE)))))
+
+        def end_to_end():
+            bench_scraper = StartupSignalScraper()
+            bench_scraper.rss_sources = {f'Feed {i}': url for i, url in enumerate(urls)}
+            # Every replayed feed is on localhost; time the pipeline, not the politeness delay
+            bench_scraper.session.limiter = None
+            bench_scraper.http_cache = HTTPCache(
+                os.path.join(cache_dir, f'e2e-{time.perf_counter_ns()}'), 50 * 1024 * 1024
+            )
+            # Fixture items are dated; a wide window keeps them all
+            return bench_scraper.scrape_rss_feeds(days_back=36500)
+
+        signals = results.measure('rss_end_to_end', len(urls), quiet(end_to_end))
+        print(f"  ({len(signals)} signals from {len(urls)} replayed feeds)", file=sys.stderr)
+
+
+def reference_tags(text: str) -> dict:
+    """First matching region and sector, one regex search per pattern"""
+    text = text.lower()
+    tags = {}
+    for name, table in (('region', REGION_PATTERNS), ('sector', SECTOR_PATTERNS)):
+        tags[name] = next(
+            (label for label, patterns in table.items()
+             if any(re.search(r'\b' + re.escape(pattern) + r'\b', text) for pattern in patterns)),
+            'Other'
+        )
+    return tags
+
+
+def run_checks(results: Results, scraper: StartupSignalScraper, templates):
+    """Correctness and timing checks on the fixtures"""
+    # Every Form D filing is a different offering; shared EDGAR boilerplate must not merge them
+    filings = pd.DataFrame([
+        {'entry_id': 'SEC EDGAR|' + accession_number(entry.id), 'title': entry.title, 'source': 'SEC EDGAR', 'url': entry.link,
+         'summary': entry.summary, 'content_type': 'SEC Filing'}
+        for entry in feedparser.parse(fixture_bytes(EDGAR_FIXTURE)).entries
+    ])
+    scraper.deduplicator = Deduplicator()
+    deduped = scraper.dedupe_signals(filings)
+    results.check(len(deduped) == len(filings),
+                  f'dedup merged EDGAR filings: {len(filings)} -> {len(deduped)}')
+
+    # Tags must match a plain per-pattern regex search
+    texts = [f'{title} {summary}' for title, summary in templates]
+    tags = scraper.tagger.tag(texts)
+    for i, text in enumerate(texts):
+        expected = reference_tags(text)
+        actual = {name: tags[name][i] for name in expected}
+        results.check(actual == expected, f'tagged fixture item {i} as {actual}, expected {expected}')
+
+    # Summaries are cleaned at ingest, before tagging
+    signals = make_signals(scraper, templates, TAG_CHECK_ROWS)
+    for signal in signals:
+        signal['summary'] = clean_summary(signal['summary'])
+    df = pd.DataFrame(signals)
+    results.measure('tag_check', len(df), lambda: scraper.tag_signals(df.copy()))
+    seconds = results.stages['tag_check']['seconds']
+    results.check(seconds < TAG_TARGET_SECONDS,
+                  f'tagging {len(df)} signals took {seconds:.2f}s (target {TAG_TARGET_SECONDS:.1f}s)')
+
+
+def run_restart_check(results: Results):
+    """Incremental runs in fresh processes must not store a story twice
+
+    Two feeds serve the same items, so every story is reported by both.
+    A second scraper on the same store stands in for the next cron run.
+    """
+    def collect(base_url: str, store: SignalStore, state_dir: str):
+        scraper = StartupSignalScraper(store=store)
+        scraper.rss_sources = {f'Feed {name}': f'{base_url}/{RSS_FIXTURE}?feed={name}' for name in 'AB'}
+        scraper.session.limiter = None
+        scraper.http_cache = HTTPCache(os.path.join(state_dir, 'http'), 50 * 1024 * 1024)
+        scraper.seen_index = SeenIndex(os.path.join(state_dir, 'seen_index.db'))
+        quiet(lambda: scraper.get_all_signals(days_back=36500, incremental=True,
+                                              sources=scraper.rss_sources))()
+        return scraper
+
+    with fixture_server() as base_url, tempfile.TemporaryDirectory() as state_dir:
+        store = SignalStore(os.path.join(state_dir, 'signals.db'))
+        collect(base_url, store, state_dir)
+        first = store.count()
+        scraper = collect(base_url, store, state_dir)
+        stored = store.query()
+        store.close()
+
+    results.check(len(stored) == first, f'restarted collection grew the store: {first} -> {len(stored)} rows')
+    clusters = [scraper.deduplicator.cluster_of(entry_id) for entry_id in stored['entry_id']]
+    results.check(len(set(clusters)) == len(clusters), 'restarted collection stored one story in several rows')
+    results.check(all(len(sources) == 2 for sources in stored['sources']),
+                  'stored stories do not list both feeds after a restart')
+
+
+def run_entry_stages(results: Results, scraper: StartupSignalScraper, signals, store_dir: str):
+    """Per-entry stages on a list of raw signal dicts"""
+    count = len(signals)
+    texts = [signal['summary'] + ' ' + signal['title'] for signal in signals]
+
+    keyword_lists = results.measure('match', count, lambda: [scraper._find_startup_keywords(text) for text in texts])
+    for signal, keywords in zip(signals, keyword_lists):
+        signal['keywords'] = keywords
+
+    df = results.measure('build_frame', count, lambda: pd.DataFrame(signals))
+    df = results.measure('tag', count, lambda: scraper.tag_signals(df.copy()))
+    df = results.measure('score', count, lambda: scraper.scoring.apply(df.copy()))
+
+    def dedupe():
+        scraper.deduplicator = Deduplicator()
+        return scraper.dedupe_signals(df)
+
+    df = results.measure('dedupe', count, dedupe)
+    compact = results.measure('compact', len(df), lambda: scraper.compact_signals(df))
+    print(f"  ({len(df)} signals after dedup, "
+          f"{df.memory_usage(deep=True).sum() // max(len(df), 1)} -> "
+          f"{compact.memory_usage(deep=True).sum() // max(len(compact), 1)} bytes/row compact)", file=sys.stderr)
+
+    results.measure('filter_memory', len(df), lambda: app.filter_signals(df, FILTERS))
+    results.measure('filter_compact', len(compact),
+                    lambda: app.filter_signals(compact, FILTERS, scraper.vocabulary))
+
+    store = SignalStore(os.path.join(store_dir, 'signals.db'))
+    results.measure('store_upsert', len(df), lambda: store.upsert(df))
+    query = app.filters_to_query(FILTERS)
+    summary = results.measure('filter_store', len(df), lambda: store.summary(**query))
+
+    def render_prep():
+        page = store.query(limit=25, order=app.SORT_OPTIONS['Signal score'], **query).to_dict('records')
+        return page, store_aggregates(store, **query)
+
+    results.measure('render_prep', summary['count'], render_prep)
+    store.close()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=sorted(SCALES), help='Synthesize this many entries instead of replaying fixtures only')
+    parser.add_argument('--feeds', type=int, default=19, help='Replayed feeds in fixture mode (default: one per RSS source)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per stage; the best is reported')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    results = Results(args.repeat)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        # The scraper creates its HTTP cache relative to the cwd, so it is
+        # only built once inside the temporary directory
+        os.chdir(work_dir)
+        try:
+            scraper = StartupSignalScraper()
+            templates = fixture_entries(scraper)
+            if args.scale:
+                count = SCALES[args.scale]
+                print(f"Scale mode: {count} synthetic entries", file=sys.stderr)
+            else:
+                count = len(templates) * args.feeds
+                print(f"Fixture mode: {args.feeds} replayed feeds", file=sys.stderr)
+                run_fetch_stages(results, scraper, args.feeds)
+                run_checks(results, scraper, templates)
+                run_restart_check(results)
+            run_entry_stages(results, scraper, make_signals(scraper, templates, count), work_dir)
+        finally:
+            os.chdir(cwd)
+
+    results.print_table()
+
+    report = {
+        'benchmark': 'pipeline',
+        'mode': args.scale or 'fixtures',
+        'entries': count,
+        'repeat': args.repeat,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'stages': results.stages,
+        'failures': results.failures,
+    }
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    for failure in results.failures:
+        print(f'FAIL: {failure}', file=sys.stderr)
+    sys.exit(1 if results.failures else 0)
+
+
+if __name__ == '__main__':
+    main()
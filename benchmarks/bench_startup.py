@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: import time of the dashboard and scraper modules
+
+Each module is imported in a fresh interpreter (best of --repeat runs) and
+checked against an import-time budget, and heavy optional dependencies
+that should only load on first use are checked for. Exits non-zero if a
+budget is exceeded or a deferred dependency was imported eagerly, so it
+can gate changes that slow down replica boot.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds allowed for a cold import, on a developer laptop
+BUDGETS = {
+    'scrapers': 0.75,
+    'app': 1.5,
+}
+
+# Modules that must not be loaded by importing these
+DEFERRED = {
+    'scrapers': ['newspaper', 'bs4', 'feedparser', 'plotly'],
+    'app': ['newspaper', 'bs4', 'feedparser', 'plotly.express'],
+}
+
+# Runs in the child interpreter. Streamlit's bare-mode warnings from
+# importing app.py go to stderr, which is discarded.
+PROBE = '''
+import json, sys, time
+preloaded = set(sys.modules)
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'modules': sorted(set(sys.modules) - preloaded)}}))
+'''
+
+
+def measure(module: str, repeat: int):
+    """Best cold import time of module and the modules it pulled in"""
+    best, loaded = None, []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(output)
+        if best is None or result['seconds'] < best:
+            best, loaded = result['seconds'], result['modules']
+    return best, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per module; the best is reported')
+    parser.add_argument('--budget', action='append', default=[], metavar='MODULE=SECONDS',
+                        help='Override a budget, e.g. --budget app=1.5')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS)
+    for override in args.budget:
+        module, _, seconds = override.partition('=')
+        budgets[module] = float(seconds)
+
+    failures = []
+    report = {}
+    for module, budget in budgets.items():
+        seconds, loaded = measure(module, args.repeat)
+        eager = [name for name in DEFERRED.get(module, []) if name in loaded]
+        report[module] = {'seconds': round(seconds, 4), 'budget': budget, 'eager_imports': eager}
+
+        status = 'ok'
+        if seconds > budget:
+            status = 'OVER BUDGET'
+            failures.append(f'{module} took {seconds:.3f}s (budget {budget}s)')
+        if eager:
+            status = 'EAGER IMPORTS'
+            failures.append(f'{module} imported {", ".join(eager)} at load time')
+        print(f'  {module:<10} : {seconds * 1000:8.1f} ms  (budget {budget * 1000:.0f} ms)  {status}', file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    for failure in failures:
+        print(f'FAIL: {failure}', file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+import pandas as pd
+
+import metrics
+from columnar import clean_summary
+from config import REGION_PATTERNS, SECTOR_PATTERNS
+from matching import KeywordMatcher, PatternTagger
+from scoring import ScoringEngine
+from signal_store import COLUMNS, JSON_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+CLASSIFY_CHUNK_SIZE = 5000
+
+
+class Classifier:
+    """Keyword detection, region/sector tagging and scoring for a frame of articles
+
+    The same column work the scraper does per source, on any frame with
+    title and summary columns. Matchers are compiled once per instance.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.matcher = KeywordMatcher(keywords)
+        self.tagger = PatternTagger({'region': REGION_PATTERNS, 'sector': SECTOR_PATTERNS})
+        self.scoring = ScoringEngine()
+
+    def classify(self, df: pd.DataFrame, matched_only: bool = False) -> pd.DataFrame:
+        """Set keywords, region, sector and signal_score on a copy of df
+
+        Summaries are cleaned of HTML first, as the scrapers do, so archived
+        markup neither matches keywords nor reaches the store.
+        """
+        df = prepare_articles(df)
+        title = df['title'].fillna('').astype(str)
+        df['summary'] = [clean_summary(text) for text in df['summary'].fillna('').astype(str)]
+        summary = df['summary']
+
+        # Same texts as the scrapers: summary first for keywords, title first for tags
+        df['keywords'] = [self.matcher.find(text) for text in summary + ' ' + title]
+        if matched_only:
+            keep = (df['keywords'].str.len() > 0).to_numpy()
+            df, title, summary = df[keep].reset_index(drop=True), title[keep], summary[keep]
+
+        tags = self.tagger.tag((title + ' ' + summary).tolist())
+        df['region'] = tags['region']
+        df['sector'] = tags['sector']
+        return self.scoring.apply(df)
+
+
+def prepare_articles(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of an archive frame with every store column present
+
+    Missing text columns are empty, list columns empty lists, and rows
+    without an entry_id get one derived from their URL (or a hash of their
+    text), so results can be upserted into the store.
+    """
+    df = df.reset_index(drop=True).copy()
+    for name in ('title', 'summary'):
+        if name not in df.columns:
+            df[name] = ''
+    if 'source' not in df.columns:
+        df['source'] = 'Archive'
+    if 'content_type' not in df.columns:
+        df['content_type'] = 'Archive'
+    if 'publish_date' in df.columns:
+        df['publish_date'] = pd.to_datetime(df['publish_date'], errors='coerce', format='mixed')
+    else:
+        df['publish_date'] = pd.NaT
+
+    if 'entry_id' not in df.columns:
+        urls = df['url'].fillna('').astype(str) if 'url' in df.columns else pd.Series('', index=df.index)
+        texts = df['title'].fillna('').astype(str) + '\n' + df['summary'].fillna('').astype(str)
+        df['entry_id'] = [
+            'Archive|' + (url or hashlib.sha1(text.encode('utf-8')).hexdigest())
+            for url, text in zip(urls, texts)
+        ]
+
+    for name in COLUMNS:
+        if name not in df.columns:
+            df[name] = [[] for _ in range(len(df))] if name in JSON_COLUMNS else None
+    return df
+
+
+# Per-process classifier, built once by the pool initializer
+_worker_classifier: Optional[Classifier] = None
+
+
+def _init_worker(keywords: Sequence[str]):
+    global _worker_classifier
+    _worker_classifier = Classifier(keywords)
+
+
+def _classify_chunk(df: pd.DataFrame, matched_only: bool) -> pd.DataFrame:
+    return _worker_classifier.classify(df, matched_only)
+
+
+class ClassificationEngine:
+    """Classify a stream of article chunks across a process pool
+
+    Chunks are handed to worker processes (spawned, each building its
+    matchers once) and results come back in input order. At most
+    max_pending chunks are queued or in flight, so memory stays bounded
+    however long the input is. With one worker everything runs in-process.
+    """
+
+    def __init__(self, keywords: Optional[Sequence[str]] = None, workers: Optional[int] = None,
+                 max_pending: Optional[int] = None):
+        if keywords is None:
+            from scrapers import STARTUP_KEYWORDS
+            keywords = STARTUP_KEYWORDS
+        self.keywords = tuple(keywords)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+
+    def classify_chunks(self, chunks: Iterable[pd.DataFrame], matched_only: bool = False) -> Iterator[pd.DataFrame]:
+        """Yield each input chunk classified, in order"""
+        if self.workers == 1:
+            classifier = Classifier(self.keywords)
+            for chunk in chunks:
+                with metrics.stage('classify'):
+                    result = classifier.classify(chunk, matched_only)
+                yield result
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.keywords,),
+        ) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_classify_chunk, chunk, matched_only))
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def classify(self, df: pd.DataFrame, chunk_size: int = CLASSIFY_CHUNK_SIZE,
+                 matched_only: bool = False) -> pd.DataFrame:
+        """Classify a whole frame, sharded into chunks across the pool"""
+        chunks = (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+        results = list(self.classify_chunks(chunks, matched_only))
+        return pd.concat(results, ignore_index=True) if results else prepare_articles(df)
+
+
+def read_articles(path: str, chunk_size: int = CLASSIFY_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Stream an archive file (CSV, NDJSON/JSONL, JSON records or Parquet) in chunks"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    elif extension in ('.ndjson', '.jsonl'):
+        yield from pd.read_json(path, lines=True, chunksize=chunk_size, convert_dates=False)
+    elif extension == '.parquet':
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif extension == '.json':
+        # A JSON array can't be streamed; it is read whole and then chunked
+        df = pd.read_json(path, convert_dates=False)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+    else:
+        raise ValueError(f"Unsupported archive format {extension!r}")
+
+
+def main():
+    """Re-run keyword detection, tagging and scoring over archived articles"""
+    import argparse
+    from export import EXPORT_FORMATS, write_export
+    from signal_store import SignalStore
+
+    formats = {name.lower(): name for name in EXPORT_FORMATS}
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('inputs', nargs='*', help='Archive files (.csv, .ndjson, .jsonl, .json, .parquet)')
+    parser.add_argument('--from-store', metavar='PATH', help='Reclassify the signals in this store instead')
+    parser.add_argument('--output', help="Output file ('-' for stdout); format from --format or the extension")
+    parser.add_argument('--format', choices=sorted(formats), help='Output format')
+    parser.add_argument('--store', metavar='PATH',
+                        help='Upsert dated results with startup keywords into this signal store')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=CLASSIFY_CHUNK_SIZE, help='Articles per chunk')
+    parser.add_argument('--matched-only', action='store_true', help='Drop articles without startup keywords')
+    args = parser.parse_args()
+
+    if not args.inputs and not args.from_store:
+        parser.error('give archive files or --from-store')
+    if not args.output and not args.store:
+        parser.error('give --output and/or --store')
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(name)s: %(message)s')
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        if args.from_store:
+            yield from SignalStore(args.from_store).iter_query(args.chunk_size)
+        for path in args.inputs:
+            yield from read_articles(path, args.chunk_size)
+
+    engine = ClassificationEngine(workers=args.workers)
+    results = engine.classify_chunks(chunks(), args.matched_only)
+
+    store = SignalStore(args.store) if args.store else None
+    counts: Dict[str, int] = {'articles': 0, 'signals': 0, 'undated': 0}
+
+    def tee(frames: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        for frame in frames:
+            matched = (frame['keywords'].str.len() > 0).to_numpy()
+            counts['articles'] += len(frame)
+            counts['signals'] += int(matched.sum())
+            if store is not None:
+                # The store holds signals only, as the scrapers write it. Its
+                # views are by publish date, so undated signals are left out
+                # rather than stamped with the time they were reclassified
+                dated = matched & frame['publish_date'].notna().to_numpy()
+                counts['undated'] += int(matched.sum() - dated.sum())
+                store.upsert(frame[dated])
+            yield frame
+
+    if args.output:
+        extension = os.path.splitext(args.output)[1].lstrip('.').lower()
+        format = formats.get(args.format or extension, 'NDJSON')
+        if args.output == '-':
+            write_export(tee(results), format, sys.stdout.buffer)
+        else:
+            with open(args.output, 'wb') as out:
+                write_export(tee(results), format, out)
+    else:
+        for _ in tee(results):
+            pass
+
+    if store is not None:
+        store.close()
+        if counts['undated']:
+            logger.warning("Skipped %d signals without a parseable publish date; they were not stored",
+                           counts['undated'])
+    print(f"Classified {counts['articles']} articles, {counts['signals']} with startup keywords "
+          f"({engine.workers} workers)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import metrics
+from config import SCRAPING_SETTINGS
+from export import EXPORT_FORMATS, write_export
+
+logger = logging.getLogger('collect')
+
+# Exit status of a collection run; argparse exits 2 on a usage error
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_PARTIAL = 3
+
+
+def _error_counts() -> Dict[str, float]:
+    """Scrape and fetch errors recorded so far, per source"""
+    counts: Dict[str, float] = {}
+    for (source, stage), value in metrics.ERRORS.values().items():
+        if stage in ('fetch', 'scrape'):
+            counts[source] = counts.get(source, 0) + value
+    return counts
+
+
+def collect_once(scraper, sources: List[str], days_back: int) -> List[str]:
+    """Run one collection; returns the sources that reported errors"""
+    before = _error_counts()
+    scraper.get_all_signals(days_back, incremental=True, sources=sources)
+    after = _error_counts()
+    return [source for source in sources if after.get(source, 0) > before.get(source, 0)]
+
+
+def write_output(scraper, path: str, format: str):
+    """Write the scraper's current signal set, replacing path atomically"""
+    from classify import prepare_articles
+
+    # Unenriched signals lack some store columns, which Parquet needs
+    df = prepare_articles(scraper.expand_signals(scraper.signals_df))
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as out:
+        rows = write_export([df], format, out)
+    os.replace(temporary, path)
+    logger.info("Wrote %d signals to %s", rows, path)
+
+
+def main() -> int:
+    """Collect startup signals without the dashboard, once or every --interval seconds
+
+    Exits 0 when every selected source was collected, 3 when some sources
+    failed and 1 when all of them failed. With --interval it runs until
+    SIGINT/SIGTERM and exits 1 only if the last run failed completely.
+    """
+    import argparse
+
+    formats = {name.lower(): name for name in EXPORT_FORMATS}
+    parser = argparse.ArgumentParser(description=main.__doc__.split('\n')[0])
+    parser.add_argument('--source', action='append', default=[], metavar='NAME',
+                        help='Collect only this source (repeatable; see --list-sources)')
+    parser.add_argument('--list-sources', action='store_true', help='Print the source names and exit')
+    parser.add_argument('--days-back', type=int, default=SCRAPING_SETTINGS['refresh_days_back'],
+                        help='Collection window in days')
+    parser.add_argument('--interval', type=float,
+                        help='Keep running, collecting every this many seconds (default: run once)')
+    parser.add_argument('--store', default=SCRAPING_SETTINGS['store_path'], help='Signal store path')
+    parser.add_argument('--no-store', action='store_true', help="Don't persist to the signal store")
+    parser.add_argument('--output', help='Also write the signal set to this file')
+    parser.add_argument('--format', choices=sorted(formats), help='Output format (default: from the extension)')
+    parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on this port')
+    parser.add_argument('--metrics-host', default=SCRAPING_SETTINGS['metrics_host'],
+                        help="Interface for --metrics-port (default: %(default)s; '0.0.0.0' for all)")
+    parser.add_argument('--verbose', '-v', action='store_true', help='Debug logging')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    from scrapers import StartupSignalScraper
+    from signal_store import SignalStore
+
+    scraper = StartupSignalScraper()
+    if args.list_sources:
+        print('\n'.join(scraper.source_names()))
+        return EXIT_OK
+
+    known = scraper.source_names()
+    unknown = [name for name in args.source if name not in known]
+    if unknown:
+        parser.error(f"unknown source(s): {', '.join(unknown)} (see --list-sources)")
+    sources = args.source or known
+
+    format: Optional[str] = None
+    if args.output:
+        extension = os.path.splitext(args.output)[1].lstrip('.').lower()
+        format = formats.get(args.format or extension)
+        if format is None:
+            parser.error('give --format or an output file ending in .json, .ndjson, .csv or .parquet')
+    if args.no_store and not args.output:
+        parser.error('--no-store needs --output, or nothing would be kept')
+
+    store = None if args.no_store else SignalStore(args.store)
+    scraper.store = store
+
+    if args.metrics_port is not None:
+        metrics.serve(args.metrics_port, args.metrics_host)
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    status = EXIT_OK
+    while True:
+        started = time.monotonic()
+        try:
+            failed = collect_once(scraper, sources, args.days_back)
+            if args.output:
+                write_output(scraper, args.output, format)
+            if len(failed) == len(sources):
+                status = EXIT_FAILED
+            elif failed:
+                status = EXIT_PARTIAL
+            else:
+                status = EXIT_OK
+            logger.info("Collected %d signals from %d sources in %.1fs%s",
+                        len(scraper.signals_df), len(sources), time.monotonic() - started,
+                        f"; failed: {', '.join(failed)}" if failed else '')
+        except Exception:
+            logger.exception("Collection failed")
+            status = EXIT_FAILED
+
+        if args.interval is None:
+            break
+        if stop.wait(max(0.0, args.interval - (time.monotonic() - started))):
+            # A partial failure in one cycle isn't a reason to fail the service
+            status = EXIT_FAILED if status == EXIT_FAILED else EXIT_OK
+            break
+
+    if store is not None:
+        store.close()
+    if scraper.enricher is not None:
+        scraper.enricher.close()
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
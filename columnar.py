@@ -0,0 +1,194 @@
+import html
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import SCRAPING_SETTINGS
+
+# Low-cardinality string columns held as categoricals
+CATEGORY_COLUMNS = ['source', 'content_type', 'region', 'sector']
+
+# Keyword-list columns held as bitmasks over a KeywordVocabulary
+KEYWORD_COLUMNS = ['keywords', 'full_keywords']
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def clean_summary(text: Optional[str], max_chars: Optional[int] = None) -> str:
+    """Plain-text summary: HTML tags and entities removed, whitespace collapsed, length bounded"""
+    max_chars = max_chars or SCRAPING_SETTINGS['summary_max_chars']
+    text = html.unescape(_TAG_RE.sub(' ', text or ''))
+    # Entities can decode to markup, which the cards would render
+    text = _SPACE_RE.sub(' ', _TAG_RE.sub(' ', text)).strip()
+    if len(text) > max_chars:
+        text = text[:max_chars].rstrip() + '...'
+    return text
+
+
+class KeywordVocabulary:
+    """Append-only keyword -> bit position map for keyword bitmasks
+
+    A row's keyword list becomes ceil(len(vocabulary) / 64) uint64 words.
+    Bits are never reassigned, so masks built earlier stay valid as new
+    (e.g. custom) keywords are added.
+    """
+
+    def __init__(self, keywords: Iterable[str] = ()):
+        self.keywords: List[str] = []
+        self.index: Dict[str, int] = {}
+        for keyword in keywords:
+            self.add(keyword)
+
+    def add(self, keyword: str) -> int:
+        """Bit position of keyword, assigning the next free bit if it is new"""
+        position = self.index.get(keyword)
+        if position is None:
+            position = self.index[keyword] = len(self.keywords)
+            self.keywords.append(keyword)
+        return position
+
+    @property
+    def words(self) -> int:
+        return max(1, -(-len(self.keywords) // 64))
+
+    def encode(self, keyword_lists: Sequence) -> np.ndarray:
+        """(rows, words) uint64 masks for a sequence of keyword lists"""
+        rows, bits = [], []
+        for row, keywords in enumerate(keyword_lists):
+            # Missing values (NaN, None) have no keywords
+            if isinstance(keywords, (list, tuple, np.ndarray)):
+                for keyword in keywords:
+                    rows.append(row)
+                    bits.append(self.add(keyword))
+
+        masks = np.zeros((len(keyword_lists), self.words), dtype=np.uint64)
+        if rows:
+            bits = np.asarray(bits, dtype=np.uint64)
+            np.bitwise_or.at(
+                masks, (np.asarray(rows), (bits // 64).astype(np.intp)),
+                np.left_shift(np.uint64(1), bits % np.uint64(64))
+            )
+        return masks
+
+    def mask(self, keywords: Iterable[str]) -> np.ndarray:
+        """Single mask with the bits of keywords set (unknown keywords are added)"""
+        return self.encode([list(keywords)])[0]
+
+    def _bits(self, masks: np.ndarray) -> np.ndarray:
+        """(rows, len(vocabulary)) boolean matrix of a mask array"""
+        as_bytes = np.ascontiguousarray(masks, dtype='<u8').view(np.uint8)
+        return np.unpackbits(as_bytes, axis=1, bitorder='little')[:, :len(self.keywords)].astype(bool)
+
+    def decode(self, masks: np.ndarray) -> List[List[str]]:
+        """Keyword lists, in vocabulary order, for a mask array"""
+        if not len(masks):
+            return []
+        rows, positions = np.nonzero(self._bits(masks))
+        keywords = np.asarray(self.keywords, dtype=object)[positions]
+        splits = np.searchsorted(rows, np.arange(1, len(masks)))
+        return [part.tolist() for part in np.split(keywords, splits)]
+
+    def contains(self, masks: np.ndarray, keywords: Iterable[str], match_all: bool = False) -> np.ndarray:
+        """Rows whose mask has any (or all) of keywords, as a boolean array"""
+        query = self.mask(keywords)
+        masks = _pad(masks, len(query))
+        hits = masks & query
+        if match_all:
+            return (hits == query).all(axis=1)
+        return (hits != 0).any(axis=1)
+
+
+def _pad(masks: np.ndarray, words: int) -> np.ndarray:
+    """Widen masks built before the vocabulary grew"""
+    if masks.shape[1] >= words:
+        return masks
+    return np.pad(masks, ((0, 0), (0, words - masks.shape[1])))
+
+
+def mask_columns(df: pd.DataFrame, name: str = 'keywords') -> List[str]:
+    """Mask word columns of a keyword column, lowest word first"""
+    prefix = f'{name}_mask_'
+    columns = [column for column in df.columns if column.startswith(prefix)]
+    return sorted(columns, key=lambda column: int(column[len(prefix):]))
+
+
+def keyword_masks(df: pd.DataFrame, name: str = 'keywords') -> np.ndarray:
+    """(rows, words) mask array of a compact frame"""
+    columns = mask_columns(df, name)
+    if not columns:
+        return np.zeros((len(df), 1), dtype=np.uint64)
+    return df[columns].to_numpy(dtype=np.uint64)
+
+
+def compact_signals(df: pd.DataFrame, vocabulary: KeywordVocabulary) -> pd.DataFrame:
+    """Compact copy of a signals frame: categoricals plus keyword bitmasks
+
+    Keyword lists become one uint64 column per 64 vocabulary entries
+    (keywords_mask_0, ...), so keyword filters and counts are bitwise
+    operations. Frames that are already compact pass through unchanged.
+    """
+    if df.empty:
+        return df
+
+    present = [name for name in KEYWORD_COLUMNS if name in df.columns]
+    result = df.drop(columns=present)
+    for name in CATEGORY_COLUMNS:
+        if name in result.columns:
+            result[name] = result[name].astype('category')
+    for name in present:
+        masks = vocabulary.encode(df[name].tolist())
+        for word in range(masks.shape[1]):
+            result[f'{name}_mask_{word}'] = masks[:, word]
+    return result
+
+
+def expand_signals(df: pd.DataFrame, vocabulary: KeywordVocabulary) -> pd.DataFrame:
+    """Plain copy of a compact frame, with keyword lists and string columns"""
+    if df.empty:
+        return df
+
+    result = df.copy()
+    for name in KEYWORD_COLUMNS:
+        columns = mask_columns(result, name)
+        if columns:
+            result[name] = vocabulary.decode(result[columns].to_numpy(dtype=np.uint64))
+            result = result.drop(columns=columns)
+    for name in CATEGORY_COLUMNS:
+        if name in result.columns and isinstance(result[name].dtype, pd.CategoricalDtype):
+            result[name] = result[name].astype(result[name].cat.categories.dtype)
+    return result
+
+
+def concat_signals(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate compact frames, keeping categoricals and zero-filling masks
+
+    A plain pd.concat falls back to object columns when the categories
+    differ.
+    """
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    for name in CATEGORY_COLUMNS:
+        if not all(name in frame.columns for frame in frames):
+            continue
+        columns = [frame[name].astype('category') for frame in frames]
+        categories = pd.api.types.union_categoricals(columns).categories
+        frames = [
+            frame.assign(**{name: column.cat.set_categories(categories)})
+            for frame, column in zip(frames, columns)
+        ]
+
+    # Zero words for frames built before the vocabulary grew; NaN would
+    # turn the column into float64 and lose high bits
+    for name in KEYWORD_COLUMNS:
+        columns = set().union(*(mask_columns(frame, name) for frame in frames))
+        frames = [
+            frame.assign(**{column: np.uint64(0) for column in columns if column not in frame.columns})
+            for frame in frames
+        ]
+
+    return pd.concat(frames, ignore_index=True)
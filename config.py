@@ -78,6 +78,27 @@ RSS_SOURCES = {
     'TechCrunch Startups': 'https://techcrunch.com/category/startups/feed/',
 }
 
+# CSS selectors for news listing pages. 'article' finds each item on the
+# page; the others are looked up inside an item. A list is tried in order
+# until one selector matches.
+DEFAULT_PAGE_SELECTORS = {
+    'article': 'article',
+    'title': ['h2', 'h3'],
+    'link': ['h2 a[href]', 'h3 a[href]', 'a[href]'],
+    'date': 'time',
+    'summary': 'p',
+}
+
+# University news listing pages -> selector overrides for that site. An
+# empty dict means DEFAULT_PAGE_SELECTORS; none of these pages has
+# site-specific selectors yet. The scraper warns and counts an error when
+# a page yields no articles, which is the sign that its markup needs them.
+UNIVERSITY_PAGES = {
+    'https://news.mit.edu/topic/innovation-entrepreneurship': {},
+    'https://news.stanford.edu/topics/business/': {},
+    'https://news.berkeley.edu/topic/business/': {},
+}
+
 # Signal scoring weights
 SIGNAL_WEIGHTS = {
     'funding_keywords': 3,  # seed, series a, etc.
@@ -110,11 +131,65 @@ SIGNAL_WEIGHTS = {
     }
 }
 
+# Keyword -> scoring category (see SIGNAL_WEIGHTS); unlisted keywords weigh 1
+KEYWORD_CATEGORIES = {
+    'funding_keywords': [
+        'seed round', 'series a', 'series b', 'funding round', 'venture capital',
+        'pre-seed', 'angel investment', 'valuation', 'unicorn', 'decacorn',
+        'pre-ipo', 'late stage', 'growth equity', 'private equity', 'venture debt',
+        'convertible note', 'safe note', 'private offering'
+    ],
+    'launch_keywords': [
+        'stealth startup', 'stealth mode', 'new startup', 'launch', 'founded',
+        'startup announces', 'emerging company', 'incubator', 'accelerator',
+        'pre-revenue', 'mvp', 'beta launch', 'product launch', 'soft launch',
+        'stealth', 'coming out of stealth'
+    ],
+    'business_keywords': [
+        'acquired by', 'acquisition', 'merger', 'ipo', 'going public', 'spac', 'pivot',
+        'strategic partnership', 'product-market fit', 'go-to-market'
+    ],
+    'tech_keywords': [
+        'tech startup', 'fintech startup', 'biotech startup', 'ai startup',
+        'machine learning startup', 'blockchain startup', 'cryptocurrency startup',
+        'healthtech startup', 'edtech startup', 'proptech startup', 'saas', 'paas', 'iaas'
+    ]
+}
+
+# Scoring settings
+SCORING_SETTINGS = {
+    'default_keyword_weight': 1,
+    'default_source_credibility': 1.0,
+    'recency_half_life_days': None,  # e.g. 7 to halve a signal's score every week
+}
+
 # Scraping settings
 SCRAPING_SETTINGS = {
     'request_timeout': 30,
     'retry_attempts': 3,
-    'delay_between_requests': 1,
+    'retry_backoff': 0.5,           # seconds; doubles after each retry
+    'pool_size': 32,                # keep-alive connections cached per host
+    'delay_between_requests': 1,    # seconds between requests to one host (token refill)
+    'rate_limit_burst': 2,          # requests a host may take back to back after idling
+    'host_delays': {                # per-host overrides of delay_between_requests
+        'www.sec.gov': 0.2,         # SEC allows at most 10 requests/second
+    },
     'max_articles_per_source': 50,
+    'max_concurrent_feeds': 8,      # global cap on feeds fetched at once
+    'max_requests_per_host': 2,     # per-host cap when fetching concurrently
+    'cache_dir': '.cache/http',     # conditional-request cache for feeds and pages
+    'cache_max_bytes': 50 * 1024 * 1024,
+    'seen_index_path': '.cache/seen_index.db',  # entries already ingested
+    'store_path': 'data/signals.db',            # durable signal history
+    'refresh_interval': 900,                    # seconds between background refreshes
+    'refresh_days_back': 7,                     # window scraped by the background refresher
+    'enrich_full_articles': False,              # download + parse full text of new RSS signals
+    'enrichment_download_workers': 8,
+    'enrichment_timeout': 20,                   # seconds per URL, for download and for parse
+    'enrichment_queue_size': 32,                # articles downloading or parsing at once
+    'analytics_cache_size': 32,                 # analytics figure sets kept per (snapshot, filters)
+    'summary_max_chars': 500,                   # stored summaries are plain text up to this length
+    'metrics_port': 9108,                       # Prometheus /metrics endpoint (None disables it)
+    'metrics_host': '127.0.0.1',                # interface it listens on; '0.0.0.0' exposes it to the network
     'user_agent': 'StartupSignal/1.0 (Educational Research Tool)'
 }
@@ -0,0 +1,198 @@
+import re
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+import pandas as pd
+
+# Query parameters that never change what a URL points to
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'guccounter', 'cmpid'}
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'\w+')
+
+# Mersenne prime 2**61 - 1 for the MinHash permutations
+_PRIME = np.uint64((1 << 61) - 1)
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so the same article from different links compares equal"""
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    """Word n-gram shingles of text with HTML stripped"""
+    words = _WORD_RE.findall(_TAG_RE.sub(' ', text).lower())
+    if len(words) <= size:
+        return [' '.join(words)] if words else []
+    return [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+class Deduplicator:
+    """Exact-URL plus MinHash/LSH near-duplicate clustering of signals
+
+    Every entry is assigned to a cluster whose id is the entry_id of its
+    first member (the root). Lookups are one URL dict probe plus one probe
+    per LSH band, so assigning N entries is linear in N and a new entry
+    never needs a pairwise comparison against the stored history.
+
+    Texts with fewer than min_shingles distinct shingles are too short to
+    compare reliably (e.g. 'No title') and only match by URL. Entries with
+    an exact key, such as an SEC accession number, match on that key alone.
+    Clusters that have left the signal set are dropped with prune().
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.5,
+                 shingle_size: int = 3, min_shingles: int = 4, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+
+        self._clusters: Dict[str, str] = {}
+        self._urls: Dict[str, str] = {}
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[int, str]] = [{} for _ in range(bands)]
+        # Root -> its URLs and (band, key) slots, so prune() can find its index entries
+        self._indexed: Dict[str, Tuple[List[str], List[Tuple[int, int]]]] = {}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a text, or None if it is too short to compare"""
+        grams = set(shingles(text, self.shingle_size))
+        if len(grams) < self.min_shingles:
+            return None
+        hashes = np.array([zlib.crc32(gram.encode('utf-8')) for gram in grams], dtype=np.uint64)
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        # Hashed band slices keep the buckets small; collisions are caught by the Jaccard check
+        return [hash(signature[i * self.rows:(i + 1) * self.rows].tobytes()) for i in range(self.bands)]
+
+    def assign(self, entry_id: str, url: str, text: str, key: Optional[str] = None) -> str:
+        """Return the cluster id for an entry, indexing it if it is new
+
+        With a key the entry only matches others with the same key; its URL
+        and text are ignored.
+        """
+        if entry_id in self._clusters:
+            return self._clusters[entry_id]
+
+        canonical = 'key:' + key if key else canonicalize_url(url)
+        root = self._urls.get(canonical) if canonical else None
+
+        signature = self.signature(text) if not key else None
+        keys = self._band_keys(signature) if signature is not None else []
+
+        if root is None and keys:
+            # Candidates share at least one band; confirm with estimated Jaccard
+            for candidate in dict.fromkeys(bucket[key] for bucket, key in zip(self._buckets, keys) if key in bucket):
+                if np.mean(self._signatures[candidate] == signature) >= self.threshold:
+                    root = candidate
+                    break
+
+        if root is None:
+            root = entry_id
+            if signature is not None:
+                self._signatures[root] = signature
+
+        self._clusters[entry_id] = root
+        indexed_urls, indexed_keys = self._indexed.setdefault(root, ([], []))
+        if canonical and self._urls.setdefault(canonical, root) == root:
+            indexed_urls.append(canonical)
+        for band, band_key in enumerate(keys):
+            if self._buckets[band].setdefault(band_key, root) == root:
+                indexed_keys.append((band, band_key))
+        return root
+
+    def prune(self, roots: Set[str]):
+        """Forget every cluster not in roots, with its URL and LSH entries"""
+        dropped = [root for root in self._indexed if root not in roots]
+        for root in dropped:
+            urls, keys = self._indexed.pop(root)
+            for canonical in urls:
+                self._urls.pop(canonical, None)
+            for band, band_key in keys:
+                if self._buckets[band].get(band_key) == root:
+                    del self._buckets[band][band_key]
+            self._signatures.pop(root, None)
+        if dropped:
+            dropped = set(dropped)
+            self._clusters = {
+                entry_id: root for entry_id, root in self._clusters.items() if root not in dropped
+            }
+
+    def collapse(self, df: pd.DataFrame, urls: Optional[List[str]] = None,
+                 keys: Optional[List[Optional[str]]] = None) -> pd.DataFrame:
+        """Collapse each cluster to one row that lists every source in a 'sources' column
+
+        The cluster root is kept when present, otherwise the first row in
+        frame order. urls overrides the URL used for exact matching per row
+        (pass '' to skip it, e.g. for rows that share a listing-page URL);
+        keys gives rows an exact key instead (None for rows without one).
+        """
+        if df.empty:
+            return df
+
+        urls = urls if urls is not None else df['url'].fillna('').tolist()
+        keys = keys if keys is not None else [None] * len(df)
+        texts = (df['title'].fillna('').astype(str) + ' ' + df['summary'].fillna('').astype(str)).tolist()
+        clusters = [
+            self.assign(entry_id, url, text, key)
+            for entry_id, url, text, key in zip(df['entry_id'], urls, texts, keys)
+        ]
+
+        # Sources of every member, including those already merged into a row
+        if 'sources' in df.columns:
+            row_sources = [
+                sources if isinstance(sources, list) and sources else [source]
+                for sources, source in zip(df['sources'], df['source'])
+            ]
+        else:
+            row_sources = [[source] for source in df['source']]
+
+        cluster_sources: Dict[str, List[str]] = {}
+        for cluster, sources in zip(clusters, row_sources):
+            merged = cluster_sources.setdefault(cluster, [])
+            merged.extend(source for source in sources if source not in merged)
+
+        # Prefer the root row, then frame order
+        is_root = df['entry_id'].to_numpy() == np.array(clusters, dtype=object)
+        order = np.argsort(~is_root, kind='stable')
+        seen = set()
+        keep = np.zeros(len(df), dtype=bool)
+        for position in order:
+            if clusters[position] not in seen:
+                seen.add(clusters[position])
+                keep[position] = True
+
+        result = df[keep].copy()
+        result['sources'] = [cluster_sources[cluster] for cluster, kept in zip(clusters, keep) if kept]
+        return result
+
+    def members_of(self, roots: Set[str]) -> Set[str]:
+        """Every assigned entry whose cluster is one of roots"""
+        return {entry_id for entry_id, root in self._clusters.items() if root in roots}
+
+    def cluster_of(self, entry_id: str) -> Optional[str]:
+        """Cluster id of an already assigned entry"""
+        return self._clusters.get(entry_id)
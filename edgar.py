@@ -0,0 +1,242 @@
+import gzip
+import logging
+import re
+import sys
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+EDGAR_ARCHIVES = 'https://www.sec.gov/Archives/edgar'
+
+# Regulation D notices of exempt (private) offerings and their amendments
+FORM_D_TYPES = ('D', 'D/A')
+
+INGEST_BATCH_SIZE = 5000
+
+_ACCESSION_RE = re.compile(r'(\d{10}-\d{2}-\d{6})')
+
+
+class Filing(NamedTuple):
+    """One row of an EDGAR form index"""
+    form_type: str
+    company: str
+    cik: int
+    date_filed: datetime
+    accession: str
+    file_name: str
+
+
+def daily_index_url(day: date) -> str:
+    """Form-sorted daily index of the filings disseminated on day"""
+    quarter = (day.month - 1) // 3 + 1
+    return f'{EDGAR_ARCHIVES}/daily-index/{day.year}/QTR{quarter}/form.{day:%Y%m%d}.idx'
+
+
+def quarterly_index_url(year: int, quarter: int) -> str:
+    """Form-sorted full index of a calendar quarter"""
+    return f'{EDGAR_ARCHIVES}/full-index/{year}/QTR{quarter}/form.idx'
+
+
+def filing_url(filing: Filing) -> str:
+    """Filing index page of a filing on sec.gov"""
+    return (f'https://www.sec.gov/Archives/edgar/data/{filing.cik}/'
+            f'{filing.accession.replace("-", "")}/{filing.accession}-index.htm')
+
+
+def accession_number(text: str) -> Optional[str]:
+    """Accession number (0001234567-24-000001) in an entry id, URL or file name"""
+    match = _ACCESSION_RE.search(text or '')
+    return match.group(1) if match else None
+
+
+def _parse_date(text: str) -> datetime:
+    # Daily indexes use 20240102, full indexes 2024-01-02
+    return datetime.strptime(text.replace('-', ''), '%Y%m%d')
+
+
+def parse_form_index(lines: Iterable[str], form_types: Sequence[str] = FORM_D_TYPES) -> Iterator[Filing]:
+    """Yield the filings of the given form types from form index lines
+
+    Works line by line, so a full quarterly index never has to be held in
+    memory. Form types are compared exactly (no keyword matching), and
+    since form indexes are sorted by form type, reading stops once the
+    requested block has been passed.
+    """
+    wanted = set(form_types)
+    last_wanted = max(wanted)
+    company_column = None
+    matched = False
+
+    for line in lines:
+        if company_column is None:
+            # Preamble, then a header naming the columns, then a rule of dashes
+            if line.startswith('Form Type'):
+                company_column = line.index('Company Name')
+            continue
+
+        form_type = line[:company_column].strip()
+        if form_type not in wanted:
+            if matched and form_type > last_wanted:
+                break
+            continue
+        matched = True
+
+        # CIK, date and file name never contain spaces; company names can
+        parts = line[company_column:].rsplit(None, 3)
+        if len(parts) != 4:
+            continue
+        company, cik, date_filed, file_name = parts
+        accession = accession_number(file_name)
+        if accession is None:
+            continue
+        yield Filing(form_type, company.strip(), int(cik), _parse_date(date_filed),
+                     accession, file_name)
+
+
+def read_index(source: str, session=None) -> Iterator[str]:
+    """Lines of a form index from a local file (optionally .gz) or a URL, streamed"""
+    if not source.startswith(('http://', 'https://')):
+        opener = gzip.open if source.endswith('.gz') else open
+        with opener(source, 'rt', encoding='latin-1', newline=None) as f:
+            for line in f:
+                yield line.rstrip('\r\n')
+        return
+
+    if session is None:
+        from transport import build_session
+        session = build_session()
+    with session.get(source, stream=True) as response:
+        if response.status_code == 404:
+            # Weekends and holidays have no daily index
+            logger.info("No EDGAR index at %s", source)
+            return
+        if response.status_code == 403:
+            # SEC refuses automated clients that don't identify themselves
+            metrics.FETCHES.inc(source='SEC EDGAR', status='403')
+            raise PermissionError(
+                f"SEC refused {source} (HTTP 403). Set SCRAPING_SETTINGS['user_agent'] to "
+                f"identify you with contact details, e.g. 'StartupSignal admin@example.com'"
+            )
+        response.raise_for_status()
+        metrics.FETCHES.inc(source='SEC EDGAR', status=str(response.status_code))
+        for line in response.iter_lines():
+            yield line.decode('latin-1').rstrip('\r')
+
+
+def filing_signal(filing: Filing) -> Dict:
+    """Signal dict for a Form D filing"""
+    notice = 'Amended notice' if filing.form_type.endswith('/A') else 'Notice'
+    return {
+        'entry_id': 'SEC EDGAR|' + filing.accession,
+        'title': f'{filing.form_type} - {filing.company} ({filing.cik:010d}) (Filer)',
+        'source': 'SEC EDGAR',
+        'url': filing_url(filing),
+        'summary': (f'{notice} of an exempt private offering of securities (Form {filing.form_type}) '
+                    f'filed by {filing.company}, CIK {filing.cik}, on {filing.date_filed:%Y-%m-%d}.'),
+        'publish_date': filing.date_filed,
+        'keywords': ['private offering'],
+        'content_type': 'SEC Filing',
+        'sources': ['SEC EDGAR'],
+    }
+
+
+def ingest(sources: Iterable[str], store, scraper, batch_size: int = INGEST_BATCH_SIZE,
+           session=None) -> Dict[str, int]:
+    """Stream Form D filings from form indexes into the signal store
+
+    Filings are tagged, scored and upserted in batches keyed by accession
+    number; accession numbers already in the store are skipped, so a
+    backfill can be re-run or resumed. Returns filings read, new signals
+    written and already-stored filings skipped.
+    """
+    totals = {'filings': 0, 'written': 0, 'skipped': 0}
+
+    def flush(batch: List[Dict]):
+        stored = store.existing_ids([signal['entry_id'] for signal in batch])
+        new = [signal for signal in batch if signal['entry_id'] not in stored]
+        totals['skipped'] += len(batch) - len(new)
+        if new:
+            with metrics.stage('edgar_ingest'):
+                df = scraper.scoring.apply(scraper.tag_signals(pd.DataFrame(new)))
+                totals['written'] += store.upsert(df)
+
+    for source in sources:
+        batch: List[Dict] = []
+        found = 0
+        # closing() ends the download as soon as the Form D block is passed
+        with closing(read_index(source, session)) as lines:
+            for filing in parse_form_index(lines):
+                batch.append(filing_signal(filing))
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    found += len(batch)
+                    batch = []
+        if batch:
+            flush(batch)
+            found += len(batch)
+        totals['filings'] += found
+        metrics.ENTRIES_PARSED.inc(found, source='SEC EDGAR')
+        logger.info("Read %d Form D filings from %s", found, source)
+
+    metrics.SIGNALS_FOUND.inc(totals['written'], source='SEC EDGAR')
+    return totals
+
+
+def index_sources(days: Optional[int] = None, quarters: Sequence[str] = (),
+                  today: Optional[date] = None) -> List[str]:
+    """Index URLs for the last `days` days and for quarters like '2024Q1'"""
+    sources = []
+    for quarter in quarters:
+        match = re.fullmatch(r'(\d{4})Q([1-4])', quarter.upper())
+        if not match:
+            raise ValueError(f"Quarter must look like 2024Q1, not {quarter!r}")
+        sources.append(quarterly_index_url(int(match.group(1)), int(match.group(2))))
+    if days:
+        today = today or date.today()
+        for offset in range(days, 0, -1):
+            day = today - timedelta(days=offset)
+            # EDGAR doesn't disseminate on weekends
+            if day.weekday() < 5:
+                sources.append(daily_index_url(day))
+    return sources
+
+
+def main():
+    """Backfill Form D private-offering signals from EDGAR form indexes"""
+    import argparse
+    from config import SCRAPING_SETTINGS
+    from scrapers import StartupSignalScraper
+    from signal_store import SignalStore
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--days', type=int, help='Daily indexes for the last N days')
+    parser.add_argument('--quarter', action='append', default=[], help='Full quarterly index, e.g. 2024Q1 (repeatable)')
+    parser.add_argument('--index', action='append', default=[], help='Local index file or URL (repeatable)')
+    parser.add_argument('--store', default=SCRAPING_SETTINGS['store_path'], help='Signal store path')
+    parser.add_argument('--batch-size', type=int, default=INGEST_BATCH_SIZE, help='Filings per upsert')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(name)s: %(message)s')
+    sources = index_sources(args.days, args.quarter) + args.index
+    if not sources:
+        parser.error('give --days, --quarter or --index')
+
+    store = SignalStore(args.store)
+    try:
+        totals = ingest(sources, store, StartupSignalScraper(), args.batch_size)
+    except PermissionError as e:
+        sys.exit(f"error: {e}")
+    finally:
+        store.close()
+    print(f"Ingested {totals['written']} new Form D signals "
+          f"({totals['skipped']} already stored) from {len(sources)} index files", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import requests
+
+import metrics
+from config import SCRAPING_SETTINGS
+from matching import KeywordMatcher
+from transport import build_session
+
+logger = logging.getLogger(__name__)
+
+# Per-process matcher, built once per worker for a given keyword list
+_worker_matcher: Optional[KeywordMatcher] = None
+
+
+def _parse_article(url: str, html: str, keywords: Tuple[str, ...]) -> Dict:
+    """Run newspaper3k parse + NLP on downloaded HTML (executed in a worker process)"""
+    global _worker_matcher
+    from newspaper import Article
+
+    if _worker_matcher is None or tuple(_worker_matcher.keywords) != keywords:
+        _worker_matcher = KeywordMatcher(keywords)
+
+    article = Article(url)
+    article.download(input_html=html)
+    article.parse()
+    try:
+        article.nlp()
+    except Exception:
+        # NLP needs NLTK data; keywords and authors don't depend on it
+        pass
+
+    return {
+        'url': url,
+        'full_keywords': _worker_matcher.find(article.text),
+        'authors': list(article.authors),
+        'full_summary': article.summary,
+    }
+
+
+class ArticleEnricher:
+    """Concurrent full-article enrichment for matched signals
+
+    Pages are downloaded on a thread pool and parsed (newspaper3k parse +
+    NLP) on a process pool across all cores. A bounded number of articles
+    is in flight at once, so downloaded HTML can't pile up faster than it
+    is parsed, and every URL has a download and a parse timeout.
+    """
+
+    def __init__(self, keywords: Sequence[str], session: Optional[requests.Session] = None,
+                 download_workers: Optional[int] = None, parse_workers: Optional[int] = None,
+                 timeout: Optional[float] = None, max_in_flight: Optional[int] = None):
+        self.keywords = tuple(keywords)
+        self.session = session or build_session()
+        self.download_workers = download_workers or SCRAPING_SETTINGS['enrichment_download_workers']
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.timeout = timeout or SCRAPING_SETTINGS['enrichment_timeout']
+        self.max_in_flight = max_in_flight or SCRAPING_SETTINGS['enrichment_queue_size']
+
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Create the worker processes on first use and keep them for later runs"""
+        if self._process_pool is None:
+            # spawn, not fork: the dashboard process runs other threads
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return self._process_pool
+
+    def _download(self, url: str) -> str:
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def enrich_urls(self, urls: Iterable[str]) -> Dict[str, Dict]:
+        """Download and parse articles; returns url -> enrichment for those that succeeded"""
+        urls = list(dict.fromkeys(url for url in urls if url))
+        if not urls:
+            return {}
+
+        results: Dict[str, Dict] = {}
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        process_pool = self._get_process_pool()
+
+        def download_and_submit(url: str):
+            try:
+                html = self._download(url)
+                return process_pool.submit(_parse_article, url, html, self.keywords)
+            except Exception as e:
+                logger.warning("Error downloading full article %s: %s", url, e)
+                metrics.ERRORS.inc(source='Full Article', stage='enrich')
+                slots.release()
+                return None
+
+        pending: List[Tuple[str, object]] = []
+        with ThreadPoolExecutor(max_workers=self.download_workers) as download_pool:
+            for url in urls:
+                # Wait while max_in_flight articles are downloading or parsing,
+                # collecting finished ones so their slots free up
+                while not slots.acquire(timeout=0.1):
+                    pending = self._collect(pending, results, slots, block=False)
+                pending.append((url, download_pool.submit(download_and_submit, url)))
+                pending = self._collect(pending, results, slots, block=False)
+
+            while pending:
+                pending = self._collect(pending, results, slots, block=True)
+
+        return results
+
+    def _collect(self, pending: List[Tuple[str, object]], results: Dict[str, Dict],
+                 slots: threading.BoundedSemaphore, block: bool) -> List[Tuple[str, object]]:
+        """Gather finished parses into results and release their slots"""
+        still_pending = []
+        for url, download in pending:
+            if not block and not download.done():
+                still_pending.append((url, download))
+                continue
+
+            parse = download.result()
+            if parse is None:
+                continue
+            if not block and not parse.done():
+                still_pending.append((url, download))
+                continue
+
+            try:
+                results[url] = parse.result(timeout=self.timeout)
+            except TimeoutError:
+                logger.warning("Timed out parsing full article %s", url)
+                metrics.ERRORS.inc(source='Full Article', stage='enrich')
+            except Exception as e:
+                logger.warning("Error parsing full article %s: %s", url, e)
+                metrics.ERRORS.inc(source='Full Article', stage='enrich')
+            slots.release()
+        return still_pending
+
+    def enrich(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Write full-text keywords and authors back into signal rows"""
+        if df.empty:
+            return df
+
+        enriched = self.enrich_urls(df['url'].tolist())
+        df['full_keywords'] = [enriched.get(url, {}).get('full_keywords', []) for url in df['url']]
+        df['authors'] = [enriched.get(url, {}).get('authors', []) for url in df['url']]
+        return df
+
+    def close(self):
+        if self._process_pool is not None:
+            self._process_pool.shutdown(cancel_futures=True)
+            self._process_pool = None
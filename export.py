@@ -0,0 +1,154 @@
+import sys
+import tempfile
+from datetime import datetime
+from typing import BinaryIO, Iterable, Optional
+
+import pandas as pd
+
+from signal_store import COLUMNS, JSON_COLUMNS, SignalStore
+
+# Export format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'JSON': ('json', 'application/json'),
+    'NDJSON': ('ndjson', 'application/x-ndjson'),
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+
+EXPORT_CHUNK_SIZE = 10000
+
+# Timestamp format of CSV exports (pandas' default varies with the data)
+CSV_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def export_filename(format: str, now: Optional[datetime] = None) -> str:
+    """Timestamped download file name for an export format"""
+    extension = EXPORT_FORMATS[format][0]
+    return f"startup_signals_{(now or datetime.now()).strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+
+def _parquet_schema():
+    """Arrow schema for the store columns, so every chunk (even all-empty lists) matches"""
+    import pyarrow as pa
+
+    fields = []
+    for name, sql_type in COLUMNS.items():
+        if name in JSON_COLUMNS:
+            arrow_type = pa.list_(pa.string())
+        elif name == 'publish_date':
+            arrow_type = pa.timestamp('us')
+        elif sql_type == 'NUMERIC':
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def write_export(chunks: Iterable[pd.DataFrame], format: str, out: BinaryIO) -> int:
+    """Write signal chunks to a binary file in the given format; returns rows written
+
+    Each chunk is encoded and written before the next is read, so memory
+    use is bounded by the chunk size. JSON output is the same document
+    DataFrame.to_json(orient='records', indent=2) would produce for the
+    whole result.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {format!r}")
+
+    rows = 0
+    writer = None
+    schema = _parquet_schema() if format == 'Parquet' else None
+
+    for chunk in chunks:
+        # Empty chunks would break the JSON separators and repeat the CSV header
+        if chunk.empty:
+            continue
+        if format == 'JSON':
+            records = chunk.to_json(orient='records', date_format='iso', indent=2)[2:-2]
+            out.write(((',\n' if rows else '[\n') + records).encode('utf-8'))
+        elif format == 'NDJSON':
+            out.write(chunk.to_json(orient='records', date_format='iso', lines=True).encode('utf-8'))
+        elif format == 'CSV':
+            out.write(chunk.to_csv(index=False, header=not rows, date_format=CSV_DATE_FORMAT).encode('utf-8'))
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk[schema.names], schema=schema, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, schema)
+            writer.write_table(table)
+        rows += len(chunk)
+
+    if format == 'JSON':
+        out.write(b'\n]' if rows else b'[]')
+    elif format == 'Parquet':
+        if writer is None:
+            import pyarrow.parquet as pq
+
+            writer = pq.ParquetWriter(out, schema)
+        writer.close()
+    return rows
+
+
+def export_file(store: SignalStore, format: str, chunk_size: int = EXPORT_CHUNK_SIZE, **filters) -> BinaryIO:
+    """Export the signals matching filters to an anonymous temporary file, rewound for reading
+
+    Chunks go to disk as they are encoded, so the export is never held in
+    memory while it is being built.
+    """
+    out = tempfile.TemporaryFile()
+    try:
+        write_export(store.iter_query(chunk_size, **filters), format, out)
+    except BaseException:
+        out.close()
+        raise
+    out.seek(0)
+    return out
+
+
+def main():
+    """Export stored signals without loading the whole history into memory"""
+    import argparse
+    from datetime import timedelta
+    from config import SCRAPING_SETTINGS
+
+    formats = {name.lower(): name for name in EXPORT_FORMATS}
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--format', choices=sorted(formats), default='ndjson', help='Output format')
+    parser.add_argument('--output', help="Output file (default: timestamped name; '-' for stdout)")
+    parser.add_argument('--store', default=SCRAPING_SETTINGS['store_path'], help='Signal store path')
+    parser.add_argument('--days', type=int, help='Only signals from the last N days')
+    parser.add_argument('--keyword', help='Search terms, as in the dashboard search box')
+    parser.add_argument('--region', help='Region filter')
+    parser.add_argument('--sector', help='Sector filter')
+    parser.add_argument('--source', help='Source filter')
+    parser.add_argument('--min-score', type=float, help='Minimum signal score')
+    parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Rows per chunk')
+    args = parser.parse_args()
+
+    format = formats[args.format]
+    filters = {
+        'keyword': args.keyword,
+        'region': args.region,
+        'sector': args.sector,
+        'source': args.source,
+        'since': datetime.now() - timedelta(days=args.days) if args.days else None,
+        'min_score': args.min_score,
+    }
+
+    store = SignalStore(args.store)
+    chunks = store.iter_query(args.chunk_size, **filters)
+    if args.output == '-':
+        rows = write_export(chunks, format, sys.stdout.buffer)
+        output = 'stdout'
+    else:
+        output = args.output or export_filename(format)
+        with open(output, 'wb') as out:
+            rows = write_export(chunks, format, out)
+    print(f"Exported {rows} signals to {output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class CachedResponse:
+    """Response body plus whether it was revalidated from the cache"""
+
+    def __init__(self, url: str, status_code: int, content: bytes,
+                 encoding: Optional[str] = None, not_modified: bool = False,
+                 key: str = '', digest: str = ''):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding
+        self.not_modified = not_modified
+        self.key = key
+        self.digest = digest
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200 or self.not_modified
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+
+class HTTPCache:
+    """On-disk conditional-request cache (ETag / Last-Modified)
+
+    Bodies are stored alongside their validators. Later requests send
+    If-None-Match / If-Modified-Since, and a 304 is served from disk. Parsed
+    results are memoized per body digest, so an unchanged resource is never
+    parsed twice. The cache is bounded by total body size and evicts the
+    least recently used entries first.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.parse_skips = 0
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+        self._parsed: Dict[str, tuple] = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the in-memory index from metadata files on disk"""
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.cache_dir, name)) as f:
+                    meta = json.load(f)
+                self._index[name[:-5]] = meta
+            except (OSError, ValueError):
+                continue
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, key + suffix)
+
+    @staticmethod
+    def _key(url: str, params: Optional[Dict]) -> str:
+        raw = url + '?' + json.dumps(params or {}, sort_keys=True)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _read_body(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key, '.body'), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_file(self, key: str, suffix: str, data, mode: str):
+        tmp = self._path(key, suffix + '.tmp')
+        with open(tmp, mode) as f:
+            f.write(data)
+        os.replace(tmp, self._path(key, suffix))
+
+    def _write(self, key: str, meta: Dict, content: bytes):
+        """Atomically write body and metadata, then enforce the size bound"""
+        self._write_file(key, '.body', content, 'wb')
+        self._write_file(key, '.json', json.dumps(meta), 'w')
+
+        with self._lock:
+            self._index[key] = meta
+            self._evict()
+
+    def _remove(self, key: str):
+        """Delete an entry's files; the caller drops it from the index"""
+        self._parsed.pop(key, None)
+        for suffix in ('.body', '.json'):
+            try:
+                os.remove(self._path(key, suffix))
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = sum(meta.get('size', 0) for meta in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k].get('accessed', 0)):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key).get('size', 0)
+            self.evictions += 1
+            self._remove(key)
+
+    def get(self, session: Any, url: str, params: Optional[Dict] = None,
+            timeout: Optional[float] = None, **kwargs) -> CachedResponse:
+        """Fetch url through session.get, revalidating any cached copy"""
+        key = self._key(url, params)
+        with self._lock:
+            meta = self._index.get(key)
+
+        request_headers = kwargs.pop('headers', None)
+        headers = dict(request_headers or {})
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = session.get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+
+        if response.status_code == 304 and meta:
+            content = self._read_body(key)
+            if content is None:
+                # The body is gone but the server still holds our validators;
+                # forget the entry and fetch the full resource again
+                with self._lock:
+                    self._index.pop(key, None)
+                    self._remove(key)
+                return self.get(session, url, params, timeout, headers=request_headers, **kwargs)
+
+            with self._lock:
+                self.hits += 1
+                meta['accessed'] = time.time()
+            # Persisted so eviction after a restart still sees the access
+            self._write_file(key, '.json', json.dumps(meta), 'w')
+            return CachedResponse(url, 304, content, meta.get('encoding'),
+                                  not_modified=True, key=key, digest=meta['digest'])
+
+        with self._lock:
+            self.misses += 1
+
+        content = response.content
+        digest = hashlib.sha1(content).hexdigest()
+        if response.status_code == 200:
+            now = time.time()
+            self._write(key, {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'encoding': response.encoding,
+                'digest': digest,
+                'size': len(content),
+                'fetched': now,
+                'accessed': now,
+            }, content)
+
+        return CachedResponse(url, response.status_code, content, response.encoding,
+                              key=key, digest=digest)
+
+    def parse(self, response: CachedResponse, parser: Callable[[bytes], Any]) -> Any:
+        """Parse a response body, reusing the previous result if the body is unchanged"""
+        with self._lock:
+            cached = self._parsed.get(response.key)
+        if cached and cached[0] == response.digest:
+            with self._lock:
+                self.parse_skips += 1
+            return cached[1]
+
+        result = parser(response.content)
+        if response.key:
+            with self._lock:
+                self._parsed[response.key] = (response.digest, result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current cache size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'parse_skips': self.parse_skips,
+                'entries': len(self._index),
+                'bytes': sum(meta.get('size', 0) for meta in self._index.values()),
+            }
@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+from urllib.parse import quote, urljoin
+
+from config import DEFAULT_PAGE_SELECTORS
+
+
+class ListingArticle(NamedTuple):
+    """One article teaser on a news listing page"""
+    title: str
+    url: str
+    published: Optional[datetime]
+    summary: str
+    text: str
+
+
+def page_selectors(overrides: Optional[Dict] = None) -> Dict[str, List[str]]:
+    """DEFAULT_PAGE_SELECTORS with a site's overrides, every value as a fallback list"""
+    selectors = {**DEFAULT_PAGE_SELECTORS, **(overrides or {})}
+    return {name: [value] if isinstance(value, str) else list(value) for name, value in selectors.items()}
+
+
+@lru_cache(maxsize=256)
+def _compile(css: str):
+    """CSS selector compiled to XPath once; translation costs more than matching"""
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(css)
+
+
+def _first(element, selectors: Sequence[str]):
+    """First element matched by the first selector that matches anything"""
+    for css in selectors:
+        found = _compile(css)(element)
+        if found:
+            return found[0]
+    return None
+
+
+def _text(element) -> str:
+    return ' '.join(element.text_content().split()) if element is not None else ''
+
+
+def parse_date(text: str) -> Optional[datetime]:
+    """Naive UTC datetime from an ISO timestamp or a human-readable date, if it parses"""
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        from dateutil import parser as date_parser
+        try:
+            parsed = date_parser.parse(text, fuzzy=True)
+        except (ValueError, OverflowError):
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_listing(html: Union[bytes, str], page_url: str, selectors: Optional[Dict] = None,
+                  limit: int = 20) -> List[ListingArticle]:
+    """Extract the articles on a news listing page with lxml and per-site CSS selectors
+
+    The page is parsed by libxml2 and only the article elements are walked;
+    title, link, date and teaser are looked up inside each one. Links are
+    made absolute against page_url. An article without a link gets the
+    page URL plus a title fragment, so articles never share a URL.
+    """
+    import lxml.html
+
+    if not html:
+        return []
+    selectors = page_selectors(selectors)
+    root = lxml.html.fromstring(html)
+
+    articles = []
+    for css in selectors['article']:
+        articles = _compile(css)(root)
+        if articles:
+            break
+
+    results = []
+    for article in articles[:limit]:
+        title = _text(_first(article, selectors['title'])) or 'No title'
+
+        link = _first(article, selectors['link'])
+        href = (link.get('href') or '').strip() if link is not None else ''
+        url = urljoin(page_url, href) if href else f'{page_url}#{quote(title)}'
+
+        date = _first(article, selectors['date'])
+        published = parse_date(date.get('datetime') or _text(date)) if date is not None else None
+
+        results.append(ListingArticle(
+            title=title,
+            url=url,
+            published=published,
+            summary=_text(_first(article, selectors['summary'])),
+            text=_text(article),
+        ))
+    return results
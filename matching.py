@@ -0,0 +1,217 @@
+import re
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# Splits text into alternating word and non-word runs, as \b sees them
+_WORD_SPLIT_RE = re.compile(r'(\W+)')
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Build a prefix-factored alternation that prefers the longest word
+
+    Python's ``re`` tries every branch of a flat alternation at each
+    position; factoring shared prefixes lets a mismatch fail after one
+    character comparison instead of one per word.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A word ends here; the greedy optional still tries longer words first
+            body = '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Compiled single-pass matcher for a fixed keyword vocabulary
+
+    Equivalent to running ``re.search(r'\\b' + re.escape(kw) + r'\\b', text.lower())``
+    for every keyword, but scans each text only once.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(keywords)
+        vocabulary = list(dict.fromkeys(kw.lower() for kw in self.keywords))
+
+        # Lowercased keyword -> its positions in the original list
+        self._positions: Dict[str, List[int]] = {}
+        for i, kw in enumerate(self.keywords):
+            self._positions.setdefault(kw.lower(), []).append(i)
+
+        # Zero-width lookahead lets matches overlap (e.g. 'pre-seed' and
+        # 'seed round'); the trie makes the longest keyword win at each position
+        self._pattern = re.compile(r'(?=\b(' + _trie_regex(vocabulary) + r')\b)')
+
+        # A longer keyword shadows shorter keywords that start at the same
+        # position, so record which keywords each one implies. Word boundaries
+        # inside a keyword are fixed by its own characters, which makes this
+        # containment check exact.
+        self._implied: Dict[str, List[str]] = {}
+        for kw in vocabulary:
+            self._implied[kw] = [
+                other for other in vocabulary
+                if other != kw and re.search(r'\b' + re.escape(other) + r'\b', kw)
+            ]
+
+    def _expand(self, found: set) -> set:
+        """Add keywords implied by the longer keywords that were matched"""
+        for kw in list(found):
+            found.update(self._implied[kw])
+        return found
+
+    def _ordered(self, found: set) -> List[str]:
+        """Return matched keywords in vocabulary order"""
+        indexes = sorted(i for kw in found for i in self._positions[kw])
+        return [self.keywords[i] for i in indexes]
+
+    def find(self, text: str) -> List[str]:
+        """Find all keywords in a single text"""
+        found = {m.group(1) for m in self._pattern.finditer(text.lower())}
+        if not found:
+            return []
+        return self._ordered(self._expand(found))
+
+
+class PatternTagger:
+    """Word-bounded multi-label tagger driven by label -> patterns tables
+
+    A pattern matches where ``re.search(r'\\b' + re.escape(pattern) + r'\\b',
+    text.lower())`` would. Rather than scanning every text with a regex, the
+    texts are split into words in one vectorized (pyarrow) pass, and
+    single-word patterns become set lookups on those words; a multi-word
+    pattern is only searched for in texts that contain all of its words.
+    Several tables (e.g. regions and sectors) share the lookups. Labels keep
+    their table's order, which doubles as priority when a single label is
+    needed.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, Sequence[str]]], default: str = 'Other'):
+        self.labels = {name: list(patterns) for name, patterns in tables.items()}
+        self.default = default
+
+        # Pattern -> (table, label index) for every label that lists it
+        self._targets: Dict[str, List[Tuple[str, int]]] = {}
+        for name, patterns in tables.items():
+            for index, words in enumerate(patterns.values()):
+                for word in words:
+                    self._targets.setdefault(word.lower(), []).append((name, index))
+
+        # Patterns that are one word match on the word alone; anything else
+        # (e.g. 'bay area', 'e-commerce') is confirmed with a regex, but only
+        # in texts that contain all of its words
+        words_of = {
+            pattern: [word for word in _WORD_SPLIT_RE.split(pattern)[::2] if word]
+            for pattern in self._targets
+        }
+        self._vocabulary = sorted({word for words in words_of.values() for word in words})
+        self._bits = {word: bit for bit, word in enumerate(self._vocabulary)}
+        self._phrases: List[Tuple[str, int, re.Pattern]] = [
+            (pattern, self._word_mask(words), re.compile(r'\b' + re.escape(pattern) + r'\b'))
+            for pattern, words in words_of.items() if words != [pattern]
+        ]
+
+    def _word_mask(self, words: Iterable[str]) -> int:
+        """Vocabulary bits of words, as one integer"""
+        mask = 0
+        for word in words:
+            mask |= 1 << self._bits[word]
+        return mask
+
+    def _word_masks(self, texts: List[str]) -> np.ndarray:
+        """(texts, words) uint64 masks of the vocabulary words in each lowercased text"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        # Whitespace split handles most tokens; only those with punctuation
+        # (or non-ASCII spaces) go through the slower regex split
+        tokens = pc.ascii_split_whitespace(pa.array(texts, pa.string()))
+        flat = pc.list_flatten(tokens)
+        owners = pc.list_parent_indices(tokens)
+        plain = pc.utf8_is_alnum(flat)
+        mixed = pc.invert(plain)
+        split = pc.utf8_split_whitespace(
+            pc.replace_substring_regex(pc.filter(flat, mixed), r'[^\p{L}\p{N}_]+', ' ')
+        )
+        words = pa.concat_arrays([pc.filter(flat, plain), pc.list_flatten(split)])
+        owners = pa.concat_arrays([
+            pc.filter(owners, plain),
+            pc.take(pc.filter(owners, mixed), pc.list_parent_indices(split)),
+        ])
+
+        bits = pc.index_in(words, value_set=pa.array(self._vocabulary, pa.string()))
+        hit = pc.is_valid(bits)
+        rows = pc.filter(owners, hit).to_numpy()
+        bits = pc.filter(bits, hit).to_numpy().astype(np.uint64)
+
+        masks = np.zeros((len(texts), max(1, -(-len(self._vocabulary) // 64))), dtype=np.uint64)
+        np.bitwise_or.at(
+            masks, (rows, (bits // 64).astype(np.intp)),
+            np.left_shift(np.uint64(1), bits % np.uint64(64))
+        )
+        return masks
+
+    def _find_batch(self, texts: Iterable[str]) -> List[FrozenSet[str]]:
+        """Patterns occurring in each text"""
+        texts = [text.lower() for text in texts]
+        if not texts:
+            return []
+
+        # Texts share a handful of distinct word sets; resolve each set once
+        unique, inverse = np.unique(self._word_masks(texts), axis=0, return_inverse=True)
+        resolved = []
+        for mask in unique:
+            present = sum(int(word) << (64 * position) for position, word in enumerate(mask))
+            as_bytes = np.ascontiguousarray(mask, dtype='<u8').view(np.uint8)
+            words = [self._vocabulary[bit] for bit in np.flatnonzero(np.unpackbits(as_bytes, bitorder='little'))]
+            found = frozenset(word for word in words if word in self._targets)
+            phrases = [(pattern, regex) for pattern, needed, regex in self._phrases if needed & present == needed]
+            resolved.append((found, phrases))
+
+        found_per_text = []
+        for text, index in zip(texts, inverse.ravel().tolist()):
+            found, phrases = resolved[index]
+            if phrases:
+                found = found.union(
+                    pattern for pattern, regex in phrases if pattern in text and regex.search(text)
+                )
+            found_per_text.append(found)
+        return found_per_text
+
+    def tag_all(self, texts: Iterable[str]) -> Dict[str, List[List[str]]]:
+        """Return every matching label for each text, per table and in table order"""
+        tagged = {name: [] for name in self.labels}
+        # Label lists per distinct set of matched patterns
+        memo: Dict[FrozenSet[str], Dict[str, List[str]]] = {}
+        for found in self._find_batch(texts):
+            labelled = memo.get(found)
+            if labelled is None:
+                hits = {name: set() for name in self.labels}
+                for word in found:
+                    for name, index in self._targets[word]:
+                        hits[name].add(index)
+                labelled = memo[found] = {
+                    name: [labels[i] for i in sorted(hits[name])] or [self.default]
+                    for name, labels in self.labels.items()
+                }
+            for name, labels in labelled.items():
+                tagged[name].append(list(labels))
+        return tagged
+
+    def tag(self, texts: Iterable[str]) -> Dict[str, List[str]]:
+        """Return the highest-priority label for each text, per table"""
+        return {
+            name: [labels[0] for labels in tagged]
+            for name, tagged in self.tag_all(texts).items()
+        }
@@ -0,0 +1,280 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from a cached local parse up to a slow upstream
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = '') -> str:
+    pairs = [
+        name + '="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple, object] = {}
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(labels.get(name, '') for name in self.labels)
+
+    def values(self) -> Dict[Tuple, object]:
+        """Copy of the current value for every label combination"""
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for key, value in sorted(self.values().items()):
+            lines.append(f'{self.name}{_format_labels(self.labels, key)} {value}')
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic count, e.g. requests or errors"""
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, e.g. a timestamp or queue size"""
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (durations) in fixed buckets"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last slot is +Inf), sum, count, last value
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0, 0.0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+            state[3] = value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self) -> Dict[Tuple, Dict[str, float]]:
+        """count / sum / last per label combination"""
+        with self._lock:
+            return {
+                key: {'count': state[2], 'sum': state[1], 'last': state[3]}
+                for key, state in self._values.items()
+            }
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip([*self.buckets, '+Inf'], counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, key)} {total}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, key)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide set of metrics, rendered in the Prometheus text format
+
+    Recording is a dict update under a per-metric lock; the text is only
+    built when something scrapes the endpoint or the health panel is open.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+FETCH_SECONDS = REGISTRY.histogram(
+    'startupsignal_fetch_seconds', 'Time to fetch a source document', ['source'])
+FETCHES = REGISTRY.counter(
+    'startupsignal_fetches_total', 'Source fetches by HTTP status', ['source', 'status'])
+FETCH_BYTES = REGISTRY.counter(
+    'startupsignal_fetch_bytes_total', 'Body bytes downloaded (304 revalidations count 0)', ['source'])
+ENTRIES_PARSED = REGISTRY.counter(
+    'startupsignal_entries_parsed_total', 'Feed entries or page articles parsed', ['source'])
+SIGNALS_FOUND = REGISTRY.counter(
+    'startupsignal_signals_found_total', 'Entries that matched startup keywords', ['source'])
+ERRORS = REGISTRY.counter(
+    'startupsignal_errors_total', 'Failures while scraping or enriching', ['source', 'stage'])
+LAST_SUCCESS = REGISTRY.gauge(
+    'startupsignal_last_success_timestamp_seconds', 'Unix time of the last successful scrape', ['source'])
+STAGE_SECONDS = REGISTRY.histogram(
+    'startupsignal_stage_seconds', 'Duration of pipeline and dashboard stages', ['stage'])
+RATE_LIMIT_WAIT = REGISTRY.histogram(
+    'startupsignal_rate_limit_wait_seconds', 'Time requests waited for their host rate limit', ['host'],
+    buckets=(0, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60))
+RATE_LIMIT_QUEUE = REGISTRY.gauge(
+    'startupsignal_rate_limit_queue', 'Requests currently waiting for their host rate limit', ['host'])
+
+
+def stage(name: str):
+    """Time a pipeline stage: ``with metrics.stage('tag'): ...``"""
+    return STAGE_SECONDS.time(stage=name)
+
+
+def record_fetch(source: str, response, started: float):
+    """Record latency, status and downloaded bytes of one fetch"""
+    FETCH_SECONDS.observe(time.perf_counter() - started, source=source)
+    FETCHES.inc(source=source, status=str(response.status_code))
+    if not getattr(response, 'not_modified', False):
+        FETCH_BYTES.inc(len(response.content), source=source)
+
+
+def source_health() -> List[Dict]:
+    """One row per source for the dashboard's health panel"""
+    latency = {key[0]: value for key, value in FETCH_SECONDS.summary().items()}
+    downloaded = {key[0]: value for key, value in FETCH_BYTES.values().items()}
+    entries = {key[0]: value for key, value in ENTRIES_PARSED.values().items()}
+    found = {key[0]: value for key, value in SIGNALS_FOUND.values().items()}
+    last_success = {key[0]: value for key, value in LAST_SUCCESS.values().items()}
+    errors: Dict[str, float] = {}
+    for (source, _), value in ERRORS.values().items():
+        errors[source] = errors.get(source, 0) + value
+
+    now = time.time()
+    rows = []
+    for source in sorted(set(latency) | set(errors)):
+        fetch = latency.get(source, {'count': 0, 'sum': 0.0, 'last': 0.0})
+        rows.append({
+            'source': source,
+            'fetches': fetch['count'],
+            'last_seconds': round(fetch['last'], 3),
+            'avg_seconds': round(fetch['sum'] / fetch['count'], 3) if fetch['count'] else None,
+            'kb': round(downloaded.get(source, 0) / 1024, 1),
+            'entries': entries.get(source, 0),
+            'signals': found.get(source, 0),
+            'errors': errors.get(source, 0),
+            'last_success_min': round((now - last_success[source]) / 60, 1) if source in last_success else None,
+        })
+    return rows
+
+
+def stage_health() -> List[Dict]:
+    """One row per timed stage: runs, last and average duration"""
+    return [
+        {
+            'stage': key[0],
+            'runs': value['count'],
+            'last_seconds': round(value['last'], 3),
+            'avg_seconds': round(value['sum'] / value['count'], 3),
+        }
+        for key, value in sorted(STAGE_SECONDS.summary().items())
+    ]
+
+
+def host_health() -> List[Dict]:
+    """One row per requested host: requests, queued now, last and average rate-limit wait"""
+    queued = {key[0]: value for key, value in RATE_LIMIT_QUEUE.values().items()}
+    return [
+        {
+            'host': key[0],
+            'requests': value['count'],
+            'queued': queued.get(key[0], 0),
+            'last_wait_seconds': round(value['last'], 3),
+            'avg_wait_seconds': round(value['sum'] / value['count'], 3),
+        }
+        for key, value in sorted(RATE_LIMIT_WAIT.summary().items())
+    ]
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int, host: str = '127.0.0.1') -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics on a daemon thread; returns None if the port is taken
+
+    Only local clients can connect unless host names another interface
+    (e.g. '0.0.0.0' for all of them).
+    """
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning("Metrics endpoint not started on %s:%s: %s", host, port, e)
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-endpoint', daemon=True).start()
+    logger.info("Serving metrics on %s:%s", host, server.server_address[1])
+    return server
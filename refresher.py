@@ -0,0 +1,128 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+import metrics
+from columnar import concat_signals
+from scrapers import StartupSignalScraper
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot(NamedTuple):
+    """Immutable view of the signal set published by the refresher
+
+    Readers must treat ``signals`` as read-only; a new snapshot (with a new
+    DataFrame) is published for every change. Signals are in the scraper's
+    compact form (see columnar.compact_signals).
+    """
+    version: int
+    signals: pd.DataFrame
+    refreshed_at: Optional[datetime]
+    days_back: int
+    in_progress: bool = False
+
+
+class BackgroundRefresher:
+    """Single process-wide scraper loop that publishes signal snapshots
+
+    One daemon thread owns the scraper and refreshes every ``interval``
+    seconds (or sooner when asked). Dashboard sessions only read the latest
+    snapshot, so page loads never wait on scraping and upstream load does
+    not grow with the number of connected users. Partial snapshots are
+    published while a refresh is running, as each source completes.
+    """
+
+    def __init__(self, scraper: StartupSignalScraper, interval: float = 900, days_back: int = 7):
+        self.scraper = scraper
+        self.interval = interval
+        self.days_back = days_back
+        self.last_error: Optional[str] = None
+        # Window asked for by request_refresh, used for the next run only
+        self._requested_days: Optional[int] = None
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._snapshot = Snapshot(0, self._initial_signals(), None, days_back)
+
+    def _initial_signals(self) -> pd.DataFrame:
+        """Seed the first snapshot from the store so a restart serves data immediately"""
+        if self.scraper.store is None:
+            return pd.DataFrame()
+        return self.scraper.compact_signals(
+            self.scraper.store.query(since=datetime.now() - timedelta(days=self.days_back))
+        )
+
+    def start(self) -> 'BackgroundRefresher':
+        """Start the refresh thread if it isn't running yet"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name='signal-refresher', daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Ask the refresh thread to exit and wait for it"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def snapshot(self) -> Snapshot:
+        """Latest published snapshot"""
+        return self._snapshot
+
+    def request_refresh(self, days_back: Optional[int] = None):
+        """Wake the refresh thread early; concurrent requests coalesce into one run
+
+        days_back applies to that run only (the widest requested window
+        wins); scheduled refreshes keep the configured window.
+        """
+        if days_back is not None:
+            with self._lock:
+                self._requested_days = max(days_back, self._requested_days or 0)
+        self._wake.set()
+
+    def refresh_once(self, days_back: Optional[int] = None):
+        """Run one refresh on the calling thread, publishing snapshots as it goes"""
+        days_back = days_back or self.days_back
+        previous = self._snapshot
+
+        self._publish(previous.signals, previous.refreshed_at, days_back, in_progress=True)
+        try:
+            with metrics.stage('refresh'):
+                received = [previous.signals] if not previous.signals.empty else []
+                for _, batch in self.scraper.iter_signals(days_back, incremental=True):
+                    received.append(self.scraper.compact_signals(batch))
+                    self._publish(concat_signals(received), previous.refreshed_at,
+                                  days_back, in_progress=True)
+            self.last_error = None
+            self._publish(self.scraper.signals_df, datetime.now(), days_back)
+        except Exception as e:
+            logger.exception("Error refreshing signals")
+            metrics.ERRORS.inc(source='refresher', stage='refresh')
+            self.last_error = str(e)
+            self._publish(previous.signals, previous.refreshed_at, days_back)
+
+    def _publish(self, signals: pd.DataFrame, refreshed_at: Optional[datetime],
+                 days_back: int, in_progress: bool = False):
+        with self._lock:
+            self._snapshot = Snapshot(
+                self._snapshot.version + 1, signals, refreshed_at, days_back, in_progress
+            )
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            with self._lock:
+                days_back, self._requested_days = self._requested_days, None
+            self.refresh_once(days_back)
+            self._wake.wait(self.interval)
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import KEYWORD_CATEGORIES, SCORING_SETTINGS, SIGNAL_WEIGHTS
+
+
+class ScoringEngine:
+    """Weighted signal scoring driven by config.SIGNAL_WEIGHTS
+
+    score = sum(category weight of each keyword)
+            x source credibility
+            x 0.5 ** (age / half_life)   (only when a half-life is set)
+
+    The keyword -> weight map is built once; scoring a frame is a handful of
+    column operations, with no per-row Python.
+    """
+
+    def __init__(self, weights: Optional[Dict] = None,
+                 categories: Optional[Dict[str, List[str]]] = None,
+                 half_life_days: Optional[float] = None):
+        weights = weights if weights is not None else SIGNAL_WEIGHTS
+        categories = categories if categories is not None else KEYWORD_CATEGORIES
+
+        self.default_weight = SCORING_SETTINGS['default_keyword_weight']
+        self.default_credibility = SCORING_SETTINGS['default_source_credibility']
+        self.half_life_days = (
+            half_life_days if half_life_days is not None
+            else SCORING_SETTINGS['recency_half_life_days']
+        )
+
+        # Keyword -> weight of its category; the first category listing a keyword wins
+        self.keyword_weights: Dict[str, float] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                self.keyword_weights.setdefault(keyword, weights.get(category, self.default_weight))
+
+        self.source_credibility: Dict[str, float] = dict(weights.get('source_credibility', {}))
+
+    def keyword_scores(self, keywords: pd.Series) -> pd.Series:
+        """Sum of keyword weights per row of a column of keyword lists"""
+        exploded = keywords.reset_index(drop=True).explode()
+        weights = exploded.map(self.keyword_weights).astype(float)
+        # Rows with no keywords explode to NaN and must score 0
+        weights = weights.fillna(self.default_weight).where(exploded.notna(), 0.0)
+        totals = weights.groupby(level=0).sum()
+        return pd.Series(totals.to_numpy(), index=keywords.index)
+
+    def credibility(self, sources: pd.Series) -> pd.Series:
+        """Credibility multiplier per row"""
+        return sources.map(self.source_credibility).astype(float).fillna(self.default_credibility)
+
+    def decay(self, publish_dates: pd.Series, now: Optional[datetime] = None) -> pd.Series:
+        """Recency multiplier per row (1.0 when no half-life is configured)"""
+        if not self.half_life_days:
+            return pd.Series(1.0, index=publish_dates.index)
+        now = pd.Timestamp(now or datetime.now())
+        age_days = (now - pd.to_datetime(publish_dates)).dt.total_seconds() / 86400
+        return pd.Series(np.power(0.5, age_days.clip(lower=0) / self.half_life_days), index=publish_dates.index)
+
+    def score(self, df: pd.DataFrame, now: Optional[datetime] = None) -> pd.Series:
+        """Weighted score for every row of a signals frame"""
+        if df.empty:
+            return pd.Series(dtype=float, index=df.index)
+        scores = self.keyword_scores(df['keywords']) * self.credibility(df['source'])
+        if 'publish_date' in df.columns:
+            scores = scores * self.decay(df['publish_date'], now)
+        return scores.round(2)
+
+    def apply(self, df: pd.DataFrame, now: Optional[datetime] = None) -> pd.DataFrame:
+        """Set signal_score on a signals frame in place and return it"""
+        if not df.empty:
+            df['signal_score'] = self.score(df, now)
+        return df
+
+
+def main():
+    """Re-score the stored history with the current weights"""
+    import argparse
+    from config import SCRAPING_SETTINGS
+    from signal_store import SignalStore
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--store', default=SCRAPING_SETTINGS['store_path'], help='Signal store path')
+    parser.add_argument('--half-life-days', type=float, default=None, help='Recency half-life')
+    args = parser.parse_args()
+
+    store = SignalStore(args.store)
+    updated = store.rescore(ScoringEngine(half_life_days=args.half_life_days))
+    print(f"Re-scored {updated} signals")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,28 +1,47 @@
-import feedparser
-import requests
-from requests_html import HTMLSession
-from bs4 import BeautifulSoup
-from newspaper import Article
 import pandas as pd
-import re
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
+import logging
+import threading
 import time
 
+import metrics
+from config import SCRAPING_SETTINGS, REGION_PATTERNS, SECTOR_PATTERNS, UNIVERSITY_PAGES
+from columnar import KeywordVocabulary, clean_summary, compact_signals, concat_signals, expand_signals
+from dedup import Deduplicator
+from edgar import accession_number
+from enrichment import ArticleEnricher
+from http_cache import HTTPCache
+from listing_parser import parse_listing
+from matching import KeywordMatcher, PatternTagger
+from seen_index import SeenIndex, content_digest
+from scoring import ScoringEngine
+from signal_store import SignalStore
+from transport import build_session
+
+logger = logging.getLogger(__name__)
+
+# Phrases that mark an entry as a startup signal
+STARTUP_KEYWORDS = [
+    'seed round', 'series a', 'series b', 'funding round', 'venture capital',
+    'stealth startup', 'stealth mode', 'new startup', 'launch', 'founded',
+    'pre-seed', 'angel investment', 'incubator', 'accelerator', 'pivot',
+    'startup announces', 'emerging company', 'tech startup', 'fintech startup',
+    'biotech startup', 'ai startup', 'machine learning startup', 'blockchain startup',
+    'cryptocurrency startup', 'healthtech startup', 'edtech startup', 'proptech startup',
+    'acquired by', 'acquisition', 'merger', 'ipo', 'going public', 'spac',
+    'unicorn', 'decacorn', 'valuation', 'pre-revenue', 'mvp', 'beta launch',
+    'product launch', 'soft launch', 'stealth', 'coming out of stealth'
+]
+
 class StartupSignalScraper:
-    def __init__(self):
-        self.session = HTMLSession()
-        self.startup_keywords = [
-            'seed round', 'series a', 'series b', 'funding round', 'venture capital',
-            'stealth startup', 'stealth mode', 'new startup', 'launch', 'founded',
-            'pre-seed', 'angel investment', 'incubator', 'accelerator', 'pivot',
-            'startup announces', 'emerging company', 'tech startup', 'fintech startup',
-            'biotech startup', 'ai startup', 'machine learning startup', 'blockchain startup',
-            'cryptocurrency startup', 'healthtech startup', 'edtech startup', 'proptech startup',
-            'acquired by', 'acquisition', 'merger', 'ipo', 'going public', 'spac',
-            'unicorn', 'decacorn', 'valuation', 'pre-revenue', 'mvp', 'beta launch',
-            'product launch', 'soft launch', 'stealth', 'coming out of stealth'
-        ]
+    def __init__(self, store: Optional[SignalStore] = None):
+        # Pooled keep-alive transport, created on first request (see session)
+        self._session = None
+        self.startup_keywords = list(STARTUP_KEYWORDS)
         
         self.rss_sources = {
             'TechCrunch': 'https://techcrunch.com/feed/',
@@ -46,79 +65,194 @@ class StartupSignalScraper:
             'TechCrunch Startups': 'https://techcrunch.com/category/startups/feed/',
         }
         
+        # News listing pages -> CSS selector overrides (see config.DEFAULT_PAGE_SELECTORS)
+        self.university_pages = dict(UNIVERSITY_PAGES)
+        
         self.accelerator_urls = [
             'https://www.ycombinator.com/companies',
             'https://techstars.com/portfolio',
             'https://www.500.co/portfolio',
         ]
+        
+        self.http_cache = HTTPCache(
+            SCRAPING_SETTINGS['cache_dir'], SCRAPING_SETTINGS['cache_max_bytes']
+        )
+        
+        # Optional durable store that every refresh is persisted to
+        self.store = store
+        
+        # Incremental ingestion state (see get_all_signals); signals_df is
+        # held compact, with keyword lists as bitmasks over self.vocabulary
+        self.signals_df = pd.DataFrame()
+        self.vocabulary = KeywordVocabulary(self.startup_keywords)
+        self.seen_index = None
+        self._known_ids = set()
+        
+        self._keyword_matcher = None
+        self._keyword_matcher_key = None
+        
+        self.tagger = PatternTagger({'region': REGION_PATTERNS, 'sector': SECTOR_PATTERNS})
+        self.scoring = ScoringEngine()
+        self.enricher = None
+        self.deduplicator = Deduplicator()
+
+    @property
+    def session(self):
+        """Pooled keep-alive transport with retries, timeouts and our user agent"""
+        if self._session is None:
+            self._session = build_session()
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
 
-    def scrape_rss_feeds(self, days_back: int = 7) -> List[Dict]:
+    def scrape_rss_feeds(self, days_back: int = 7, concurrent: bool = True,
+                         max_workers: Optional[int] = None,
+                         max_per_host: Optional[int] = None) -> List[Dict]:
         """Scrape RSS feeds for startup signals"""
-        signals = []
         cutoff_date = datetime.now() - timedelta(days=days_back)
         
-        for source_name, feed_url in self.rss_sources.items():
-            try:
-                print(f"  Scraping {source_name}...")
-                # Set user agent and timeout for feedparser
-                import socket
-                socket.setdefaulttimeout(10)
-                
-                feed = feedparser.parse(feed_url)
+        tasks = self._feed_tasks(cutoff_date)
+        
+        if not concurrent:
+            signals = []
+            for _, _, fetch in tasks:
+                signals.extend(fetch())
+            return signals
+        
+        # Results are reassembled in source order so the output matches the serial path
+        results = [[] for _ in tasks]
+        for index, feed_signals in self._run_tasks(tasks, max_workers, max_per_host):
+            results[index] = feed_signals
+        
+        return [signal for feed_signals in results for signal in feed_signals]
+
+    def _feed_tasks(self, cutoff_date: datetime,
+                    incremental: bool = False) -> List[Tuple[str, Optional[str], Callable[[], List[Dict]]]]:
+        """One (source, host, fetch) task per RSS feed"""
+        return [
+            (source_name, urlparse(feed_url).netloc,
+             lambda source_name=source_name, feed_url=feed_url: self._scrape_feed(
+                 source_name, feed_url, cutoff_date, incremental))
+            for source_name, feed_url in self.rss_sources.items()
+        ]
+
+    def _run_tasks(self, tasks: List[Tuple[str, Optional[str], Callable[[], List[Dict]]]],
+                   max_workers: Optional[int] = None,
+                   max_per_host: Optional[int] = None) -> Iterator[Tuple[int, List[Dict]]]:
+        """Run (source, host, fetch) tasks on a thread pool, yielding (index, signals) as each completes
+        
+        Concurrency is capped globally and per host, so sources sharing a
+        domain don't pile onto it. Tasks without a host are only capped globally.
+        """
+        max_workers = max_workers or SCRAPING_SETTINGS['max_concurrent_feeds']
+        max_per_host = max_per_host or SCRAPING_SETTINGS['max_requests_per_host']
+        
+        host_limits = {
+            host: threading.BoundedSemaphore(max_per_host)
+            for _, host, _ in tasks if host is not None
+        }
+        
+        def run(host: Optional[str], fetch: Callable[[], List[Dict]]) -> List[Dict]:
+            if host is None:
+                return fetch()
+            with host_limits[host]:
+                return fetch()
+        
+        # Each source is parsed and matched in its worker as soon as it arrives
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(run, host, fetch): i
+                for i, (_, host, fetch) in enumerate(tasks)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _scrape_feed(self, source_name: str, feed_url: str, cutoff_date: datetime,
+                     incremental: bool = False) -> List[Dict]:
+        """Fetch a single RSS feed and extract its startup signals"""
+        signals = []
+        
+        try:
+            logger.debug("Scraping %s", source_name)
+            started = time.perf_counter()
+            response = self.http_cache.get(self.session, feed_url)
+            metrics.record_fetch(source_name, response, started)
+            if not response.ok:
+                logger.warning("HTTP %s for %s", response.status_code, source_name)
+                metrics.ERRORS.inc(source=source_name, stage='fetch')
+                return signals
+            
+            # Unchanged feeds (304 or identical body) reuse the previous parse
+            import feedparser
+            feed = self.http_cache.parse(response, feedparser.parse)
+            metrics.ENTRIES_PARSED.inc(len(feed.entries), source=source_name)
+            
+            if not feed.entries:
+                logger.info("No entries found for %s", source_name)
+                metrics.LAST_SUCCESS.set(time.time(), source=source_name)
+                return signals
+            
+            # Limit entries per source for performance
+            entries_to_process = feed.entries[:50]  # Max 50 entries per source
+            
+            candidates = []
+            for entry in entries_to_process:
+                # Parse publish date
+                try:
+                    if hasattr(entry, 'published_parsed'):
+                        pub_date = datetime(*entry.published_parsed[:6])
+                    elif hasattr(entry, 'updated_parsed'):
+                        pub_date = datetime(*entry.updated_parsed[:6])
+                    else:
+                        pub_date = datetime.now()
+                except:
+                    pub_date = datetime.now()
                 
-                if not feed.entries:
-                    print(f"    No entries found for {source_name}")
+                # Skip if too old
+                if pub_date < cutoff_date:
                     continue
                 
-                # Limit entries per source for performance
-                entries_to_process = feed.entries[:50]  # Max 50 entries per source
-                signals_found = 0
-                
-                for entry in entries_to_process:
-                    # Parse publish date
-                    try:
-                        if hasattr(entry, 'published_parsed'):
-                            pub_date = datetime(*entry.published_parsed[:6])
-                        elif hasattr(entry, 'updated_parsed'):
-                            pub_date = datetime(*entry.updated_parsed[:6])
-                        else:
-                            pub_date = datetime.now()
-                    except:
-                        pub_date = datetime.now()
-                    
-                    # Skip if too old
-                    if pub_date < cutoff_date:
-                        continue
-                    
-                    # Extract text content
-                    content = entry.get('summary', '') + ' ' + entry.get('title', '')
+                candidates.append((entry, pub_date))
+            
+            # Check all entries for startup keywords in one pass
+            entry_ids = [
+                source_name + '|' + (entry.get('id') or entry.get('link') or entry.get('title', ''))
+                for entry, _ in candidates
+            ]
+            contents = [
+                entry.get('summary', '') + ' ' + entry.get('title', '')
+                for entry, _ in candidates
+            ]
+            keyword_lists = self._match_entries(entry_ids, contents, incremental)
+            
+            for (entry, pub_date), entry_id, matching_keywords in zip(candidates, entry_ids, keyword_lists):
+                if matching_keywords:
+                    signal = {
+                        'entry_id': entry_id,
+                        'title': entry.get('title', 'No title'),
+                        'source': source_name,
+                        'url': entry.get('link', ''),
+                        'summary': clean_summary(entry.get('summary', '')),
+                        'publish_date': pub_date,
+                        'keywords': matching_keywords,
+                        'signal_score': len(matching_keywords),
+                        'content_type': 'RSS Feed'
+                    }
+                    signals.append(signal)
                     
-                    # Check for startup keywords
-                    matching_keywords = self._find_startup_keywords(content)
+            logger.info("Found %d signals from %s", len(signals), source_name)
+            metrics.SIGNALS_FOUND.inc(len(signals), source=source_name)
+            metrics.LAST_SUCCESS.set(time.time(), source=source_name)
                     
-                    if matching_keywords:
-                        signal = {
-                            'title': entry.get('title', 'No title'),
-                            'source': source_name,
-                            'url': entry.get('link', ''),
-                            'summary': entry.get('summary', ''),
-                            'publish_date': pub_date,
-                            'keywords': matching_keywords,
-                            'signal_score': len(matching_keywords),
-                            'content_type': 'RSS Feed'
-                        }
-                        signals.append(signal)
-                        signals_found += 1
-                        
-                print(f"    Found {signals_found} signals from {source_name}")
-                        
-            except Exception as e:
-                print(f"Error scraping {source_name}: {str(e)}")
-                continue
-                
+        except Exception as e:
+            logger.warning("Error scraping %s: %s", source_name, e)
+            metrics.ERRORS.inc(source=source_name, stage='scrape')
+            
         return signals
 
-    def scrape_sec_filings(self, days_back: int = 30) -> List[Dict]:
+    def scrape_sec_filings(self, days_back: int = 30, incremental: bool = False) -> List[Dict]:
         """Scrape SEC EDGAR for recent filings (simplified version)"""
         signals = []
         
@@ -133,88 +267,130 @@ class StartupSignalScraper:
                 'output': 'atom'
             }
             
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
+            started = time.perf_counter()
+            response = self.http_cache.get(self.session, url, params=params)
+            metrics.record_fetch('SEC EDGAR', response, started)
+            if not response.ok:
+                logger.warning("HTTP %s for SEC EDGAR", response.status_code)
+                metrics.ERRORS.inc(source='SEC EDGAR', stage='fetch')
+            else:
                 # Parse the atom feed
-                feed = feedparser.parse(response.text)
+                import feedparser
+                feed = self.http_cache.parse(response, feedparser.parse)
+                metrics.ENTRIES_PARSED.inc(len(feed.entries), source='SEC EDGAR')
                 
-                for entry in feed.entries:
+                # Look for startup indicators across all filings in one pass.
+                # Filings are keyed by accession number, as in edgar.ingest
+                entry_ids = [
+                    'SEC EDGAR|' + (accession_number(entry.get('id')) or accession_number(entry.get('link'))
+                                    or entry.get('id') or entry.get('link', ''))
+                    for entry in feed.entries
+                ]
+                contents = [
+                    entry.get('summary', '') + ' ' + entry.get('title', '')
+                    for entry in feed.entries
+                ]
+                keyword_lists = self._match_entries(entry_ids, contents, incremental)
+                
+                for entry, entry_id, matching_keywords in zip(feed.entries, entry_ids, keyword_lists):
                     # Extract filing information
                     title = entry.get('title', '')
                     content = entry.get('summary', '')
                     
-                    # Look for startup indicators
-                    matching_keywords = self._find_startup_keywords(content + ' ' + title)
-                    
                     if matching_keywords:
                         signal = {
+                            'entry_id': entry_id,
                             'title': title,
                             'source': 'SEC EDGAR',
                             'url': entry.get('link', ''),
-                            'summary': content[:500] + '...' if len(content) > 500 else content,
-                            'publish_date': datetime.now(),  # Would parse actual date
+                            'summary': clean_summary(content),
+                            'publish_date': (
+                                datetime(*entry.updated_parsed[:6]) if entry.get('updated_parsed') else datetime.now()
+                            ),
                             'keywords': matching_keywords,
                             'signal_score': len(matching_keywords),
                             'content_type': 'SEC Filing'
                         }
                         signals.append(signal)
+                
+                metrics.SIGNALS_FOUND.inc(len(signals), source='SEC EDGAR')
+                metrics.LAST_SUCCESS.set(time.time(), source='SEC EDGAR')
                         
         except Exception as e:
-            print(f"Error scraping SEC filings: {str(e)}")
+            logger.warning("Error scraping SEC filings: %s", e)
+            metrics.ERRORS.inc(source='SEC EDGAR', stage='scrape')
             
         return signals
 
-    def scrape_university_news(self, days_back: int = 14) -> List[Dict]:
+    def scrape_university_news(self, days_back: int = 14, incremental: bool = False) -> List[Dict]:
         """Scrape university press releases for startup activity"""
         signals = []
+        cutoff_date = datetime.now() - timedelta(days=days_back)
         
-        university_urls = [
-            'https://news.mit.edu/topic/innovation-entrepreneurship',
-            'https://news.stanford.edu/topics/business/',
-            'https://news.berkeley.edu/topic/business/',
-        ]
-        
-        for url in university_urls:
+        for url, selectors in self.university_pages.items():
             try:
-                response = self.session.get(url)
-                soup = BeautifulSoup(response.html.html, 'html.parser')
+                started = time.perf_counter()
+                response = self.http_cache.get(self.session, url)
+                metrics.record_fetch('University News', response, started)
+                if not response.ok:
+                    logger.warning("HTTP %s for %s", response.status_code, url)
+                    metrics.ERRORS.inc(source='University News', stage='fetch')
+                    continue
                 
-                # Extract articles (this would need to be customized per site)
-                articles = soup.find_all('article', limit=20)
+                articles = self.http_cache.parse(
+                    response, functools.partial(parse_listing, page_url=url, selectors=selectors)
+                )
+                metrics.ENTRIES_PARSED.inc(len(articles), source='University News')
+                if not articles:
+                    # A listing page that parses to nothing means the selectors no longer fit it
+                    logger.warning("No articles matched the selectors on %s; check UNIVERSITY_PAGES", url)
+                    metrics.ERRORS.inc(source='University News', stage='scrape')
+                    continue
                 
-                for article in articles:
-                    title_elem = article.find('h2') or article.find('h3')
-                    title = title_elem.get_text(strip=True) if title_elem else 'No title'
-                    
-                    content = article.get_text(strip=True)
-                    
-                    # Check for startup keywords
-                    matching_keywords = self._find_startup_keywords(content)
-                    
+                # Undated articles are kept; dated ones must fall in the window
+                articles = [
+                    article for article in articles
+                    if article.published is None or article.published >= cutoff_date
+                ]
+                
+                # Check for startup keywords
+                entry_ids = ['University News|' + article.url for article in articles]
+                keyword_lists = self._match_entries(entry_ids, [article.text for article in articles], incremental)
+                
+                for article, entry_id, matching_keywords in zip(articles, entry_ids, keyword_lists):
                     if matching_keywords:
                         signal = {
-                            'title': title,
+                            'entry_id': entry_id,
+                            'title': article.title,
                             'source': 'University News',
-                            'url': url,
-                            'summary': content[:300] + '...' if len(content) > 300 else content,
-                            'publish_date': datetime.now(),  # Would parse actual date
+                            'url': article.url,
+                            'summary': clean_summary(article.summary or article.text, 300),
+                            'publish_date': article.published or datetime.now(),
                             'keywords': matching_keywords,
                             'signal_score': len(matching_keywords),
                             'content_type': 'Press Release'
                         }
                         signals.append(signal)
+                
+                metrics.LAST_SUCCESS.set(time.time(), source='University News')
                         
             except Exception as e:
-                print(f"Error scraping university news: {str(e)}")
+                logger.warning("Error scraping university news %s: %s", url, e)
+                metrics.ERRORS.inc(source='University News', stage='scrape')
                 continue
-                
+        
+        metrics.SIGNALS_FOUND.inc(len(signals), source='University News')
         return signals
 
     def scrape_full_article(self, url: str) -> Optional[Dict]:
         """Use newspaper3k to extract and summarize full articles"""
+        from newspaper import Article
+        
         try:
+            response = self.session.get(url)
+            response.raise_for_status()
             article = Article(url)
-            article.download()
+            article.download(input_html=response.text)
             article.parse()
             article.nlp()
             
@@ -236,79 +412,254 @@ class StartupSignalScraper:
                 }
                 
         except Exception as e:
-            print(f"Error scraping full article {url}: {str(e)}")
+            logger.warning("Error scraping full article %s: %s", url, e)
+            metrics.ERRORS.inc(source='Full Article', stage='scrape')
             
         return None
 
+    def _match_entries(self, entry_ids: List[str], contents: List[str],
+                       incremental: bool = False) -> List[Optional[List[str]]]:
+        """Keyword-match entries, skipping unchanged ones during an incremental refresh
+        
+        Skipped entries come back as None; their signals (if any) are already
+        in the current signal set.
+        """
+        if not incremental:
+            return [self._find_startup_keywords(content) for content in contents]
+        
+        digests = [content_digest(content) for content in contents]
+        fresh = [
+            i for i, (entry_id, digest) in enumerate(zip(entry_ids, digests))
+            if not self.seen_index.is_unchanged(entry_id, digest, self._known_ids)
+        ]
+        
+        results = [None] * len(contents)
+        matched = [self._find_startup_keywords(contents[i]) for i in fresh]
+        for i, keywords in zip(fresh, matched):
+            results[i] = keywords
+        
+        self.seen_index.record(
+            (entry_ids[i], digests[i], bool(keywords)) for i, keywords in zip(fresh, matched)
+        )
+        return results
+
+    def enrich_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add full-text keywords and authors to RSS signals using the enrichment pool"""
+        if self.enricher is None:
+            self.enricher = ArticleEnricher(self.startup_keywords, session=self.session)
+        
+        rss = (df['content_type'] == 'RSS Feed').tolist()
+        enriched = self.enricher.enrich_urls(df['url'][rss].tolist())
+        
+        rows = [enriched.get(url, {}) if is_rss else {} for url, is_rss in zip(df['url'], rss)]
+        df['full_keywords'] = [row.get('full_keywords', []) for row in rows]
+        df['authors'] = [row.get('authors', []) for row in rows]
+        return df
+
     def _find_startup_keywords(self, text: str) -> List[str]:
         """Find startup-related keywords in text"""
-        text_lower = text.lower()
-        found_keywords = []
+        return self.keyword_matcher.find(text)
+
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """Compiled matcher for the current keyword list, rebuilt if the list changes"""
+        keywords = tuple(self.startup_keywords)
+        if self._keyword_matcher is None or self._keyword_matcher_key != keywords:
+            self._keyword_matcher = KeywordMatcher(keywords)
+            self._keyword_matcher_key = keywords
+        return self._keyword_matcher
+
+    def source_names(self) -> List[str]:
+        """Every source get_all_signals can collect from, in collection order"""
+        return list(self.rss_sources) + ['SEC EDGAR', 'University News']
+
+    def get_all_signals(self, days_back: int = 7, incremental: bool = False,
+                        sources: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Aggregate all signals from different sources
         
-        for keyword in self.startup_keywords:
-            if re.search(r'\b' + re.escape(keyword) + r'\b', text_lower):
-                found_keywords.append(keyword)
-                
-        return found_keywords
+        With incremental=True only new or changed entries are matched and
+        tagged; they are merged into the signal set from the previous call.
+        sources limits collection to those names (see source_names).
+        """
+        for _ in self.iter_signals(days_back, incremental, sources):
+            pass
+        return self.expand_signals(self.signals_df)
 
-    def get_all_signals(self, days_back: int = 7) -> pd.DataFrame:
-        """Aggregate all signals from different sources"""
-        all_signals = []
+    def iter_signals(self, days_back: int = 7, incremental: bool = False,
+                     sources: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Yield (source, tagged signal batch) as each source completes
         
-        print("Scraping RSS feeds...")
-        all_signals.extend(self.scrape_rss_feeds(days_back))
+        All sources (or only those named in sources) are fetched
+        concurrently. With a store, each batch's new stories are persisted
+        before it is yielded, so store readers see them while the run goes
+        on. Once the generator is exhausted self.signals_df holds the
+        aggregated result get_all_signals returns, in compact form.
+        """
+        if incremental:
+            if self.seen_index is None:
+                self.seen_index = SeenIndex(SCRAPING_SETTINGS['seen_index_path'])
+            if self.signals_df.empty and self.store is not None:
+                # Resume from persisted signals, e.g. after a restart
+                self.signals_df = self._resume_signals(days_back)
+            present = set(self.signals_df['entry_id']) if not self.signals_df.empty else set()
+            # Duplicates collapsed into a present signal count as known too
+            roots = {self.deduplicator.cluster_of(entry_id) or entry_id for entry_id in present}
+            self._known_ids = present | self.deduplicator.members_of(roots)
         
-        print("Scraping SEC filings...")
-        all_signals.extend(self.scrape_sec_filings(days_back))
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+        tasks = self._feed_tasks(cutoff_date, incremental) + [
+            ('SEC EDGAR', 'www.sec.gov', lambda: self.scrape_sec_filings(days_back, incremental)),
+            ('University News', None, lambda: self.scrape_university_news(days_back, incremental)),
+        ]
+        if sources is not None:
+            selected = set(sources)
+            tasks = [task for task in tasks if task[0] in selected]
+        
+        logger.info("Scraping RSS feeds, SEC filings and university news...")
+        batches = [pd.DataFrame() for _ in tasks]
+        for index, signals in self._run_tasks(tasks):
+            if not signals:
+                continue
+            # Add region and sector tags, then weighted scores
+            with metrics.stage('tag'):
+                batch = self.tag_signals(pd.DataFrame(signals))
+            with metrics.stage('score'):
+                batch = self.scoring.apply(batch)
+            batches[index] = batch
+            if self.store is not None:
+                with metrics.stage('store'):
+                    self.store.upsert(self.first_reports(batch))
+            yield tasks[index][0], batch
+        
+        # Assemble in source order so the result doesn't depend on completion order
+        batches = [batch for batch in batches if not batch.empty]
+        df = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame()
         
-        print("Scraping university news...")
-        all_signals.extend(self.scrape_university_news(days_back))
+        if not df.empty and SCRAPING_SETTINGS['enrich_full_articles']:
+            with metrics.stage('enrich'):
+                df = self.enrich_signals(df)
         
-        # Convert to DataFrame
-        df = pd.DataFrame(all_signals)
+        df = self.compact_signals(df)
+        new_ids = set(df['entry_id']) if not df.empty else set()
+        
+        if incremental:
+            with metrics.stage('merge'):
+                df = self._merge_signals(df, days_back)
         
         if not df.empty:
-            # Sort by signal score and publish date
-            df = df.sort_values(['signal_score', 'publish_date'], ascending=[False, False])
-            
-            # Add region and sector tags (simplified)
-            df['region'] = df.apply(self._extract_region, axis=1)
-            df['sector'] = df.apply(self._extract_sector, axis=1)
+            with metrics.stage('dedupe'):
+                # Sort by signal score and publish date
+                df = df.sort_values(['signal_score', 'publish_date'], ascending=[False, False])
+                
+                # Collapse cross-source copies of the same story
+                df = self.dedupe_signals(df)
+        
+        if new_ids and self.store is not None:
+            # Persist new signals plus the clusters they joined (their sources changed)
+            touched = new_ids | {self.deduplicator.cluster_of(entry_id) for entry_id in new_ids}
+            with metrics.stage('store'):
+                self.store.upsert(self.expand_signals(df[df['entry_id'].isin(touched)]))
+        
+        # Stories that left the signal set no longer need matching against
+        kept = df['entry_id'] if not df.empty else []
+        self.deduplicator.prune({self.deduplicator.cluster_of(entry_id) for entry_id in kept})
+        self.signals_df = df
+
+    def _resume_signals(self, days_back: int) -> pd.DataFrame:
+        """Stored signals of the last days_back days, with the deduplicator seeded from them
+        
+        Without the seeding, copies of stored stories fetched after a
+        restart would start new clusters and be stored a second time.
+        Duplicates an earlier run left in the store are collapsed into
+        their cluster's row and deleted.
+        """
+        # query() returns the strongest and newest first, the order dedupe expects
+        stored = self.store.query(since=datetime.now() - timedelta(days=days_back))
+        if stored.empty:
+            return self.compact_signals(stored)
+        
+        df = self.dedupe_signals(stored)
+        absorbed = set(stored['entry_id']) - set(df['entry_id'])
+        if absorbed:
+            joined = {self.deduplicator.cluster_of(entry_id) for entry_id in absorbed}
+            self.store.upsert(df[df['entry_id'].isin(joined)])
+            self.store.delete(absorbed)
+            logger.info("Removed %d duplicate stored signals", len(absorbed))
+        return self.compact_signals(df)
+
+    def first_reports(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rows of df that start a new story cluster, strongest first
+        
+        Rows that join a known story are left out; the collapsed row with
+        their source added is written at the end of the run.
+        """
+        df = self.dedupe_signals(df.sort_values(['signal_score', 'publish_date'], ascending=[False, False]))
+        roots = [self.deduplicator.cluster_of(entry_id) == entry_id for entry_id in df['entry_id']]
+        return df[roots]
+
+    def dedupe_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Collapse exact-URL and near-duplicate signals into one row per story
+        
+        SEC filings share most of their text (the EDGAR boilerplate), so
+        they are matched by accession number only, never by similarity.
+        """
+        filings = (df['content_type'] == 'SEC Filing').tolist() if 'content_type' in df.columns else [False] * len(df)
+        keys = [
+            accession_number(entry_id) or accession_number(url) if is_filing else None
+            for entry_id, url, is_filing in zip(df['entry_id'], df['url'].fillna(''), filings)
+        ]
+        return self.deduplicator.collapse(df, keys=keys)
+
+    def _merge_signals(self, new_df: pd.DataFrame, days_back: int) -> pd.DataFrame:
+        """Merge freshly processed signals into the current signal set"""
+        existing = self.signals_df
+        if existing.empty:
+            return new_df
+        
+        # Changed entries replace their previous version
+        if not new_df.empty:
+            existing = existing[~existing['entry_id'].isin(new_df['entry_id'])]
+        
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+        existing = existing[existing['publish_date'] >= cutoff_date]
+        
+        if new_df.empty:
+            return existing
+        return concat_signals([existing, new_df])
+
+    def compact_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Compact form of a signals frame (categoricals + keyword bitmasks)"""
+        return compact_signals(df, self.vocabulary)
+
+    def expand_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Plain form of a compact signals frame, with keyword lists"""
+        return expand_signals(df, self.vocabulary)
+
+    def tag_signals(self, df: pd.DataFrame, multi_label: bool = False) -> pd.DataFrame:
+        """Add region and sector tags to a signals DataFrame in one batch pass"""
+        if df.empty:
+            return df
+        
+        # Build the tagging text for the whole column at once
+        texts = (
+            df['title'].fillna('').astype(str) + ' ' + df['summary'].fillna('').astype(str)
+        ).tolist()
+        
+        tags = self.tagger.tag_all(texts)
+        
+        df['region'] = [labels[0] for labels in tags['region']]
+        df['sector'] = [labels[0] for labels in tags['sector']]
+        
+        if multi_label:
+            df['regions'] = tags['region']
+            df['sectors'] = tags['sector']
             
         return df
 
     def _extract_region(self, row) -> str:
-        """Extract region from content (simplified)"""
-        content = (row['title'] + ' ' + row['summary']).lower()
-        
-        if any(word in content for word in ['silicon valley', 'san francisco', 'bay area', 'palo alto']):
-            return 'Silicon Valley'
-        elif any(word in content for word in ['new york', 'nyc', 'manhattan']):
-            return 'New York'
-        elif any(word in content for word in ['boston', 'cambridge', 'mit']):
-            return 'Boston'
-        elif any(word in content for word in ['london', 'uk', 'england']):
-            return 'London'
-        elif any(word in content for word in ['tel aviv', 'israel']):
-            return 'Tel Aviv'
-        else:
-            return 'Other'
+        """Extract region from content"""
+        return self.tagger.tag([row['title'] + ' ' + row['summary']])['region'][0]
 
     def _extract_sector(self, row) -> str:
-        """Extract sector from content (simplified)"""
-        content = (row['title'] + ' ' + row['summary']).lower()
-        
-        if any(word in content for word in ['ai', 'artificial intelligence', 'machine learning', 'ml']):
-            return 'AI/ML'
-        elif any(word in content for word in ['fintech', 'financial', 'banking', 'payment']):
-            return 'FinTech'
-        elif any(word in content for word in ['health', 'medical', 'biotech', 'pharma']):
-            return 'HealthTech'
-        elif any(word in content for word in ['education', 'edtech', 'learning']):
-            return 'EdTech'
-        elif any(word in content for word in ['blockchain', 'crypto', 'defi', 'nft']):
-            return 'Blockchain'
-        elif any(word in content for word in ['saas', 'software', 'platform']):
-            return 'SaaS'
-        else:
-            return 'Other'
+        """Extract sector from content"""
+        return self.tagger.tag([row['title'] + ' ' + row['summary']])['sector'][0]
@@ -0,0 +1,78 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional, Set, Tuple
+
+
+def content_digest(text: str) -> str:
+    """Stable hash of the text an entry is matched on"""
+    return hashlib.sha1(text.encode('utf-8', errors='replace')).hexdigest()
+
+
+class SeenIndex:
+    """Persistent index of ingested entries keyed by GUID/URL plus content hash
+
+    Lets an incremental refresh skip keyword matching and tagging for
+    entries it has already processed and that have not changed since.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen ('
+            ' entry_id TEXT PRIMARY KEY,'
+            ' digest TEXT NOT NULL,'
+            ' matched INTEGER NOT NULL,'
+            ' last_seen REAL NOT NULL)'
+        )
+        self._conn.commit()
+
+    def lookup(self, entry_id: str) -> Optional[Tuple[str, bool]]:
+        """Return (digest, matched) for an entry, or None if never seen"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT digest, matched FROM seen WHERE entry_id = ?', (entry_id,)
+            ).fetchone()
+        return (row[0], bool(row[1])) if row else None
+
+    def is_unchanged(self, entry_id: str, digest: str, known_ids: Set[str]) -> bool:
+        """True if the entry needs no reprocessing
+
+        An entry is unchanged when its content hash matches and either it
+        produced no signal last time or its signal is still in the current
+        set (known_ids). A matched entry whose signal was lost, e.g. after a
+        restart, is reprocessed.
+        """
+        seen = self.lookup(entry_id)
+        if seen is None or seen[0] != digest:
+            return False
+        return not seen[1] or entry_id in known_ids
+
+    def record(self, entries: Iterable[Tuple[str, str, bool]]):
+        """Store (entry_id, digest, matched) for processed entries"""
+        now = time.time()
+        rows = [(entry_id, digest, int(matched), now) for entry_id, digest, matched in entries]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO seen (entry_id, digest, matched, last_seen) '
+                'VALUES (?, ?, ?, ?)', rows
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
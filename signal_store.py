@@ -0,0 +1,444 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from columnar import clean_summary
+
+# Persisted columns and their SQLite types. New columns are added to
+# existing databases on open, so extending this table is enough to
+# migrate a store.
+COLUMNS = {
+    'entry_id': 'TEXT PRIMARY KEY',
+    'title': 'TEXT',
+    'source': 'TEXT',
+    'url': 'TEXT',
+    'summary': 'TEXT',
+    'publish_date': 'TEXT',
+    'keywords': 'TEXT',
+    'signal_score': 'NUMERIC',
+    'content_type': 'TEXT',
+    'region': 'TEXT',
+    'sector': 'TEXT',
+    'authors': 'TEXT',
+    'full_keywords': 'TEXT',
+    'sources': 'TEXT',
+}
+
+# List-valued columns, stored as JSON text
+JSON_COLUMNS = {'keywords', 'authors', 'full_keywords', 'sources'}
+
+INDEXED_COLUMNS = ['publish_date', 'source', 'region', 'sector', 'signal_score']
+
+# Columns of each column's index. The dashboard's filters, counts and page
+# ordering read only these, so its queries are answered from the indexes
+# without touching the (wide) table rows.
+INDEX_COLUMNS = {
+    'publish_date': ['publish_date', 'signal_score', 'source', 'region', 'sector'],
+    'source': ['source', 'publish_date', 'signal_score'],
+    'region': ['region', 'publish_date', 'signal_score'],
+    'sector': ['sector', 'publish_date', 'signal_score'],
+    'signal_score': ['signal_score'],
+}
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# query() order: strongest, then newest first
+DEFAULT_ORDER = [('signal_score', False), ('publish_date', False)]
+
+# Columns covered by the full-text search index
+SEARCH_COLUMNS = ['title', 'summary', 'keywords']
+
+_PHRASE_RE = re.compile(r'"([^"]*)"|(\S+)')
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def search_expression(text: str) -> Optional[str]:
+    """Translate search box input into an FTS5 MATCH expression
+
+    Every term must match (AND). Bare terms match as word prefixes, so
+    "fin" finds "fintech"; "quoted text" matches that exact phrase. The
+    input is always taken literally: FTS operators and punctuation in it
+    have no special meaning. Returns None if the input has no words.
+    """
+    terms = []
+    for quoted, bare in _PHRASE_RE.findall(text):
+        tokens = _TOKEN_RE.findall(quoted if quoted else bare)
+        if tokens:
+            phrase = '"' + ' '.join(tokens) + '"'
+            terms.append(phrase if quoted else phrase + '*')
+    return ' '.join(terms) if terms else None
+
+
+class SignalStore:
+    """Durable SQLite store for signals with indexes on the filter columns
+
+    Dates are stored as sortable ISO text so range predicates use the
+    publish_date index. Filters are pushed down into SQL instead of being
+    applied to an in-memory copy of the whole history. Keyword search goes
+    through an FTS5 inverted index over title, summary and keywords that
+    triggers keep in step with every write.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_schema()
+
+    def _create_schema(self):
+        columns = ', '.join(f'{name} {sql_type}' for name, sql_type in COLUMNS.items())
+        with self._lock:
+            self._conn.execute(f'CREATE TABLE IF NOT EXISTS signals ({columns})')
+
+            existing = {row[1] for row in self._conn.execute('PRAGMA table_info(signals)')}
+            for name, sql_type in COLUMNS.items():
+                if name not in existing:
+                    self._conn.execute(f'ALTER TABLE signals ADD COLUMN {name} {sql_type}')
+
+            for name in INDEXED_COLUMNS:
+                columns = INDEX_COLUMNS[name]
+                if len(columns) > 1:
+                    # Replaced by a covering index; stores created before it have the single-column one
+                    self._conn.execute(f'DROP INDEX IF EXISTS idx_signals_{name}')
+                    index = f'idx_signals_{name}_covering'
+                else:
+                    index = f'idx_signals_{name}'
+                self._conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS {index} ON signals ({", ".join(columns)})'
+                )
+            self._create_search_index()
+            self._migrate()
+            self._conn.commit()
+
+    def _create_search_index(self):
+        """Create the FTS5 index and its sync triggers, indexing existing rows once"""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'signals_fts'"
+        ).fetchone()
+
+        columns = ', '.join(SEARCH_COLUMNS)
+        new_values = ', '.join(f'new.{name}' for name in SEARCH_COLUMNS)
+        old_values = ', '.join(f'old.{name}' for name in SEARCH_COLUMNS)
+        # Rewrites of unchanged text (re-upserted clusters) skip the reindex
+        changed = ' OR '.join(f'old.{name} IS NOT new.{name}' for name in SEARCH_COLUMNS)
+        self._conn.executescript(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS signals_fts USING fts5(
+                {columns}, content='signals', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2'
+            );
+            CREATE TRIGGER IF NOT EXISTS signals_fts_insert AFTER INSERT ON signals BEGIN
+                INSERT INTO signals_fts (rowid, {columns}) VALUES (new.rowid, {new_values});
+            END;
+            CREATE TRIGGER IF NOT EXISTS signals_fts_delete AFTER DELETE ON signals BEGIN
+                INSERT INTO signals_fts (signals_fts, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+            END;
+            CREATE TRIGGER IF NOT EXISTS signals_fts_update AFTER UPDATE OF {columns} ON signals
+            WHEN {changed} BEGIN
+                INSERT INTO signals_fts (signals_fts, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+                INSERT INTO signals_fts (rowid, {columns}) VALUES (new.rowid, {new_values});
+            END;
+        ''')
+        if not exists:
+            self._conn.execute("INSERT INTO signals_fts (signals_fts) VALUES ('rebuild')")
+
+    def _migrate(self):
+        """One-off data migrations, tracked in PRAGMA user_version"""
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < 1:
+            # SEC filings from the atom feed were keyed by their urn:tag id; key
+            # them by accession number like bulk EDGAR ingests, keeping one row
+            urn = "entry_id LIKE 'SEC EDGAR|urn:%accession-number=%'"
+            self._conn.execute(
+                "UPDATE OR IGNORE signals SET entry_id = 'SEC EDGAR|' || "
+                f"substr(entry_id, instr(entry_id, 'accession-number=') + 17) WHERE {urn}"
+            )
+            self._conn.execute(f'DELETE FROM signals WHERE {urn}')
+            self._conn.execute('PRAGMA user_version = 1')
+        if version < 2:
+            # Atom feed filings were stored with the raw EDGAR HTML as summary
+            rows = self._conn.execute(
+                "SELECT entry_id, summary FROM signals WHERE content_type = 'SEC Filing' "
+                "AND (summary LIKE '%<%' OR summary LIKE '%&%')"
+            ).fetchall()
+            self._conn.executemany(
+                'UPDATE signals SET summary = ? WHERE entry_id = ?',
+                [(clean_summary(summary), entry_id) for entry_id, summary in rows]
+            )
+            self._conn.execute('PRAGMA user_version = 2')
+
+    @staticmethod
+    def _encode(df: pd.DataFrame, names: List[str]) -> List[tuple]:
+        """Convert DataFrame columns to SQLite row tuples, column by column"""
+        columns = []
+        for name in names:
+            values = df[name]
+            if name in JSON_COLUMNS:
+                # Missing values (None, or NaN after a concat) are empty lists
+                columns.append([
+                    json.dumps(list(value)) if isinstance(value, (list, tuple, np.ndarray)) else '[]'
+                    for value in values
+                ])
+            elif name == 'publish_date':
+                columns.append(pd.to_datetime(values).dt.strftime(DATE_FORMAT).tolist())
+            else:
+                # tolist() turns numpy scalars into plain Python values
+                columns.append(values.tolist())
+        return list(zip(*columns))
+
+    def upsert(self, df: pd.DataFrame) -> int:
+        """Insert or update signals by entry_id; returns the number of rows written"""
+        if df.empty:
+            return 0
+
+        names = [name for name in COLUMNS if name in df.columns]
+        rows = self._encode(df, names)
+        placeholders = ', '.join('?' for _ in names)
+        updates = ', '.join(f'{name} = excluded.{name}' for name in names if name != 'entry_id')
+        with self._lock:
+            # An upsert rather than INSERT OR REPLACE: rows keep their rowid and
+            # the update trigger (not a silent delete) keeps the search index in sync
+            self._conn.executemany(
+                f'INSERT INTO signals ({", ".join(names)}) VALUES ({placeholders}) '
+                f'ON CONFLICT (entry_id) DO UPDATE SET {updates}',
+                rows,
+            )
+            self._conn.commit()
+            # Keep planner statistics current as the table grows
+            self._conn.execute('PRAGMA optimize')
+        return len(rows)
+
+    def rescore(self, engine, chunk_size: int = 50000) -> int:
+        """Recompute signal_score for the whole history with a ScoringEngine
+        
+        Works through the table in rowid chunks so memory stays bounded.
+        """
+        updated = 0
+        last_rowid = 0
+        while True:
+            with self._lock:
+                chunk = pd.read_sql_query(
+                    'SELECT rowid, entry_id, source, keywords, publish_date FROM signals '
+                    'WHERE rowid > ? ORDER BY rowid LIMIT ?',
+                    self._conn, params=[last_rowid, chunk_size]
+                )
+            if chunk.empty:
+                break
+            last_rowid = int(chunk['rowid'].iloc[-1])
+
+            scores = engine.score(self._decode(chunk))
+            with self._lock:
+                self._conn.executemany(
+                    'UPDATE signals SET signal_score = ? WHERE entry_id = ?',
+                    zip(scores.tolist(), chunk['entry_id'].tolist())
+                )
+                self._conn.commit()
+            updated += len(chunk)
+        return updated
+
+    def _where(self, keyword: Optional[str] = None, region: Optional[str] = None,
+               sector: Optional[str] = None, source: Optional[str] = None,
+               since: Optional[datetime] = None, min_score: Optional[float] = None):
+        """Build a WHERE clause and its parameters from filter values"""
+        clauses = []
+        params: List = []
+
+        for name, value in (('region', region), ('sector', sector), ('source', source)):
+            if value and value != 'All':
+                clauses.append(f'{name} = ?')
+                params.append(value)
+
+        if since is not None:
+            clauses.append('publish_date >= ?')
+            params.append(since.strftime(DATE_FORMAT))
+
+        if min_score:
+            clauses.append('signal_score >= ?')
+            params.append(min_score)
+
+        expression = search_expression(keyword) if keyword else None
+        if expression:
+            # Row ids from the inverted index, intersected with the other predicates.
+            # Unary + makes this a membership test on rows found through the
+            # covering indexes, instead of a table-row lookup per search hit
+            clauses.append('+rowid IN (SELECT rowid FROM signals_fts WHERE signals_fts MATCH ?)')
+            params.append(expression)
+
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        return where, params
+
+    @staticmethod
+    def _order_by(order: Optional[Sequence[Tuple[str, bool]]] = None) -> str:
+        """ORDER BY clause for (column, ascending) pairs; strongest and newest first by default"""
+        order = order or DEFAULT_ORDER
+        terms = []
+        for name, ascending in order:
+            if name not in COLUMNS:
+                raise ValueError(f"Unknown column {name!r}")
+            # Unary + keeps SQLite from walking another column's index just to
+            # avoid a sort; newest-first can walk the publish_date index itself
+            prefix = '' if name == 'publish_date' else '+'
+            terms.append(f'{prefix}{name} {"ASC" if ascending else "DESC"}')
+        # rowid breaks ties, so pages of the same query never overlap
+        return ' ORDER BY ' + ', '.join(terms + ['rowid'])
+
+    def query(self, limit: Optional[int] = None, offset: int = 0,
+              order: Optional[Sequence[Tuple[str, bool]]] = None, **filters) -> pd.DataFrame:
+        """Return matching signals, strongest and newest first unless order says otherwise
+
+        With limit and offset only that page of the result is read, so a
+        dashboard page costs the same however many signals match.
+        """
+        where, params = self._where(**filters)
+        order_by = self._order_by(order)
+        if limit:
+            # The page's rowids are picked from the covering indexes, then only
+            # those rows are read
+            sql = (f'SELECT * FROM signals WHERE rowid IN '
+                   f'(SELECT rowid FROM signals{where}{order_by} LIMIT ? OFFSET ?){order_by}')
+            params.extend([limit, offset])
+        else:
+            sql = f'SELECT * FROM signals{where}{order_by}'
+
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        return self._decode(df)
+
+    def iter_query(self, chunk_size: int = 10000, **filters) -> Iterator[pd.DataFrame]:
+        """Yield matching signals in chunks, in query() order
+
+        Rows are streamed from a cursor on a separate read connection (WAL
+        readers don't block writers), so memory stays flat however much
+        history matches and the store lock isn't held between chunks.
+        """
+        where, params = self._where(**filters)
+        sql = f'SELECT * FROM signals{where}{self._order_by()}'
+
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute('PRAGMA query_only = ON')
+            for chunk in pd.read_sql_query(sql, conn, params=params, chunksize=chunk_size):
+                yield self._decode(chunk)
+        finally:
+            conn.close()
+
+    def count(self, **filters) -> int:
+        """Number of signals matching the filters"""
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM signals{where}', params).fetchone()[0]
+
+    def summary(self, **filters) -> Dict:
+        """Count, average score and per-source counts of the signals matching the filters
+
+        One aggregate query over the covering indexes; source_counts is
+        most frequent first, so its first entry is the top source.
+        """
+        where, params = self._where(**filters)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT source, COUNT(*) AS n, SUM(signal_score) FROM signals{where} '
+                'GROUP BY source ORDER BY n DESC, source', params
+            ).fetchall()
+        count = sum(n for _, n, _ in rows)
+        return {
+            'count': count,
+            'avg_score': sum(total or 0 for _, _, total in rows) / count if count else None,
+            'source_counts': pd.Series([n for _, n, _ in rows], index=[source for source, _, _ in rows],
+                                       name='count', dtype='int64'),
+        }
+
+    def value_counts(self, column: str, **filters) -> pd.Series:
+        """Matching signals per value of an indexed column, most frequent first"""
+        if column not in INDEXED_COLUMNS:
+            raise ValueError(f"Column {column!r} is not indexed")
+        where, params = self._where(**filters)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT {column}, COUNT(*) AS n FROM signals{where} '
+                f'GROUP BY {column} ORDER BY n DESC, {column}', params
+            ).fetchall()
+        return pd.Series([n for _, n in rows], index=[value for value, _ in rows], name='count', dtype='int64')
+
+    def daily_counts(self, **filters) -> pd.DataFrame:
+        """Matching signals per publish day, oldest first, as date and count columns"""
+        where, params = self._where(**filters)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT substr(publish_date, 1, 10) AS day, COUNT(*) FROM signals{where} '
+                'GROUP BY day ORDER BY day', params
+            ).fetchall()
+        return pd.DataFrame({
+            'date': pd.to_datetime([day for day, _ in rows], format='%Y-%m-%d'),
+            'count': [n for _, n in rows],
+        })
+
+    def existing_ids(self, entry_ids: Iterable[str]) -> Set[str]:
+        """The given entry_ids that are already stored"""
+        with self._lock:
+            # One JSON parameter instead of a placeholder per id, so any batch size fits
+            rows = self._conn.execute(
+                'SELECT entry_id FROM signals WHERE entry_id IN (SELECT value FROM json_each(?))',
+                [json.dumps(list(entry_ids))]
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def delete(self, entry_ids: Iterable[str]) -> int:
+        """Delete signals by entry_id; returns the number of rows removed"""
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM signals WHERE entry_id IN (SELECT value FROM json_each(?))',
+                [json.dumps(list(entry_ids))]
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def distinct(self, column: str) -> List[str]:
+        """Sorted distinct values of an indexed column"""
+        if column not in INDEXED_COLUMNS:
+            raise ValueError(f"Column {column!r} is not indexed")
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT DISTINCT {column} FROM signals WHERE {column} IS NOT NULL ORDER BY {column}'
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def _decode(df: pd.DataFrame) -> pd.DataFrame:
+        """Convert SQLite values back to the DataFrame shapes the app uses"""
+        if df.empty:
+            return df
+        for name in JSON_COLUMNS:
+            if name in df.columns:
+                # Columns that were never written come back NULL, read as None or NaN
+                df[name] = [json.loads(value) if isinstance(value, str) and value else [] for value in df[name]]
+        df['publish_date'] = pd.to_datetime(df['publish_date'], format=DATE_FORMAT)
+        return df
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def filters_to_query(filters: Dict) -> Dict:
+    """Translate the dashboard's filter dict into SignalStore.query arguments"""
+    return {
+        'keyword': filters.get('keyword') or None,
+        'region': filters.get('region'),
+        'sector': filters.get('sector'),
+        'source': filters.get('source'),
+        'since': datetime.now() - timedelta(days=filters['date_range']) if filters.get('date_range') else None,
+        'min_score': filters.get('min_score') or None,
+    }
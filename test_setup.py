@@ -12,8 +12,8 @@ def test_imports():
         'streamlit',
         'feedparser', 
         'requests',
-        'requests_html',
-        'bs4',  # beautifulsoup4
+        'lxml',
+        'cssselect',
         'newspaper',  # newspaper3k
         'pandas',
         'plotly',
@@ -0,0 +1,136 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+from config import SCRAPING_SETTINGS
+
+# Responses worth retrying: rate limiting and transient upstream failures
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class _Bucket:
+    """Token bucket state for one host"""
+
+    def __init__(self, delay: float, burst: int):
+        self.delay = delay
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.waiting = 0
+
+
+class HostRateLimiter:
+    """Per-host token buckets shared by every request the scrapers make
+
+    Each host earns one token every `delay` seconds, up to `burst` saved
+    tokens, and a request spends one. A request that finds the bucket
+    empty reserves the next token and sleeps until it is due, so waiters
+    on a host go out in arrival order while other hosts proceed in
+    parallel. Host delays default to delay_between_requests, with
+    per-host overrides in host_delays.
+    """
+
+    def __init__(self, delay: Optional[float] = None, burst: Optional[int] = None,
+                 host_delays: Optional[Dict[str, float]] = None):
+        self.delay = SCRAPING_SETTINGS['delay_between_requests'] if delay is None else delay
+        self.burst = burst or SCRAPING_SETTINGS['rate_limit_burst']
+        self.host_delays = SCRAPING_SETTINGS['host_delays'] if host_delays is None else host_delays
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def _bucket(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self.host_delays.get(host, self.delay), self.burst)
+        return bucket
+
+    def acquire(self, host: str) -> float:
+        """Block until host may be requested again; returns the seconds waited"""
+        with self._lock:
+            bucket = self._bucket(host)
+            if bucket.delay <= 0:
+                return 0.0
+            now = time.monotonic()
+            bucket.tokens = min(bucket.burst, bucket.tokens + (now - bucket.updated) / bucket.delay)
+            bucket.updated = now
+            # Going negative reserves a future token for this caller
+            bucket.tokens -= 1
+            wait = -bucket.tokens * bucket.delay if bucket.tokens < 0 else 0.0
+            if wait:
+                bucket.waiting += 1
+                metrics.RATE_LIMIT_QUEUE.set(bucket.waiting, host=host)
+
+        if wait:
+            time.sleep(wait)
+            with self._lock:
+                bucket.waiting -= 1
+                metrics.RATE_LIMIT_QUEUE.set(bucket.waiting, host=host)
+        metrics.RATE_LIMIT_WAIT.observe(wait, host=host)
+        return wait
+
+
+class PooledSession(requests.Session):
+    """requests.Session with a default per-request timeout and a host rate limit
+
+    requests has no session-wide timeout, so one is filled in for any call
+    that doesn't pass its own. Each request first waits for its host's
+    token from the limiter, if there is one.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, limiter: Optional[HostRateLimiter] = None):
+        super().__init__()
+        self.timeout = timeout
+        self.limiter = limiter
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        if self.limiter is not None:
+            self.limiter.acquire(urlparse(url).netloc)
+        return super().request(method, url, **kwargs)
+
+
+# Process-wide limiter, so every session shares each host's capacity
+RATE_LIMITER = HostRateLimiter()
+
+
+def build_session(timeout: Optional[float] = None, retries: Optional[int] = None,
+                  backoff: Optional[float] = None, pool_size: Optional[int] = None,
+                  user_agent: Optional[str] = None,
+                  limiter: Optional[HostRateLimiter] = RATE_LIMITER) -> PooledSession:
+    """Shared HTTP transport for every scraper: keep-alive pools, retries, timeouts
+
+    Connections are kept alive per host, so repeated fetches from the same
+    site skip the TCP and TLS handshakes. Connection errors and retryable
+    statuses are retried up to `retries` times with exponential backoff,
+    honouring Retry-After. Every request carries the configured user agent
+    and times out after `timeout` seconds unless the caller passes its own.
+    Requests are paced per host by `limiter` (the shared RATE_LIMITER by
+    default; None disables pacing). Defaults come from SCRAPING_SETTINGS.
+    """
+    retries = SCRAPING_SETTINGS['retry_attempts'] if retries is None else retries
+    pool_size = pool_size or SCRAPING_SETTINGS['pool_size']
+
+    session = PooledSession(timeout or SCRAPING_SETTINGS['request_timeout'], limiter)
+    session.headers['User-Agent'] = user_agent or SCRAPING_SETTINGS['user_agent']
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=SCRAPING_SETTINGS['retry_backoff'] if backoff is None else backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=('GET', 'HEAD'),
+        # Hand back the last response rather than raising once retries run out
+        raise_on_status=False,
+    )
+    # pool_connections is the number of hosts with a cached pool,
+    # pool_maxsize the connections kept open per host
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session